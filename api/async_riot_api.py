@@ -0,0 +1,92 @@
+"""
+Async Riot API
+RiotAPI metodlarının asyncio sürümü (event loop'u bloklamaz)
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Callable, Any
+from api.riot_api import RiotAPI
+from config.settings import ENRICH_MAX_WORKERS
+from utils.cancellation import with_context
+
+
+class AsyncRiotAPI:
+    """
+    RiotAPI ile aynı metodları sunan async sınıf
+    İstekler RiotAPI'nin havuzlu session'ı ve rate limiter'ı üzerinden, sınırlı sayıda
+    worker thread'inde çalışır; monitor döngüsü ve websocket dinleyicisi beklemez.
+    """
+
+    def __init__(self, riot_api: RiotAPI, max_concurrency: int = ENRICH_MAX_WORKERS):
+        """
+        Args:
+            riot_api: Senkron RiotAPI instance (session, rate limiter ve cache paylaşılır)
+            max_concurrency: Aynı anda çalışabilecek istek sayısı
+        """
+        self.riot_api = riot_api
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="riot-api")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Çalışan event loop'a ait semaphore'u döndürür (asyncio.run her çağrıda yeni loop açar)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Blocking bir fonksiyonu eşzamanlılık sınırı içinde worker thread'inde çalıştırır
+        Args:
+            func: Çalıştırılacak fonksiyon
+        Returns:
+            Fonksiyonun dönüş değeri
+        """
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            # İptal token'ı worker thread'ine context ile taşınır
+            return await loop.run_in_executor(self._executor, with_context(functools.partial(func, *args, **kwargs)))
+
+    async def get_match_id(self, puuid: str) -> Optional[str]:
+        """RiotAPI.get_match_id"""
+        return await self.run(self.riot_api.get_match_id, puuid)
+
+    async def get_pregame_match_id(self, puuid: str) -> Optional[str]:
+        """RiotAPI.get_pregame_match_id"""
+        return await self.run(self.riot_api.get_pregame_match_id, puuid)
+
+    async def get_pregame_match(self, match_id: str) -> Optional[Dict]:
+        """RiotAPI.get_pregame_match"""
+        return await self.run(self.riot_api.get_pregame_match, match_id)
+
+    async def get_match_details(self, match_id: str) -> Optional[Dict]:
+        """RiotAPI.get_match_details"""
+        return await self.run(self.riot_api.get_match_details, match_id)
+
+    async def get_match_loadouts(self, match_id: str) -> Optional[Dict]:
+        """RiotAPI.get_match_loadouts"""
+        return await self.run(self.riot_api.get_match_loadouts, match_id)
+
+    async def get_player_names(self, puuids: List[str]) -> Optional[List[Dict]]:
+        """RiotAPI.get_player_names"""
+        return await self.run(self.riot_api.get_player_names, puuids)
+
+    async def get_player_rank(self, puuid: str) -> Optional[Dict]:
+        """RiotAPI.get_player_rank"""
+        return await self.run(self.riot_api.get_player_rank, puuid)
+
+    async def get_current_season(self) -> Optional[str]:
+        """RiotAPI.get_current_season"""
+        return await self.run(self.riot_api.get_current_season)
+
+    async def get_match_history(self, puuid: str, start_index: int = 0, end_index: int = 5, queue: str = "competitive") -> Optional[Dict]:
+        """RiotAPI.get_match_history"""
+        return await self.run(self.riot_api.get_match_history, puuid, start_index, end_index, queue)
+
+    async def get_completed_match_details(self, match_id: str) -> Optional[Dict]:
+        """RiotAPI.get_completed_match_details"""
+        return await self.run(self.riot_api.get_completed_match_details, match_id)
@@ -5,8 +5,13 @@ Match details, player info, ranks vb.
 import requests
 import time
 from typing import Optional, Dict, List
-from config.settings import REGION, SHARD, VANDAL_UUID, VANDAL_SOCKET_ID
+from config.settings import REGION, SHARD, VANDAL_UUID, VANDAL_SOCKET_ID, API_RATE_LIMITS, API_MAX_RETRIES
 from utils.cache import cache
+from utils.disk_cache import disk_cache
+from utils.rate_limiter import RateLimiter, parse_retry_after
+from utils.http import create_session
+from utils.history_store import MatchHistoryStore
+from utils.cancellation import check_cancelled, is_cancelled
 
 # urllib3 uyarılarını devre dışı bırak
 try:
@@ -38,6 +43,45 @@ class RiotAPI:
             "Authorization": f"Bearer {access_token}"
         }
 
+        # Keep-alive bağlantı havuzu (her istek için yeni TLS handshake yapılmaz)
+        self.session = create_session(headers=self.headers, verify=False)
+
+        # Host bazlı istek bütçesi (GameService ve web aynı instance'ı kullanır)
+        self.rate_limiter = RateLimiter(API_RATE_LIMITS)
+
+        # Oyuncu/kuyruk başına birleşik maç geçmişi penceresi
+        self.history_store = MatchHistoryStore(self._fetch_match_history)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Host'un rate limiter'ından geçerek istek atar
+        429 gelirse Retry-After kadar bekleyip API_MAX_RETRIES kez tekrar dener
+        Çalışan işin iptal token'ı (utils.cancellation) iptal edildiyse istek atılmaz, OperationCancelled fırlatılır
+        Args:
+            method: HTTP metodu
+            url: İstek URL'si
+            **kwargs: requests parametreleri
+        Returns:
+            requests.Response: Yanıt (denemeler tükenirse son 429 yanıtı)
+        """
+        bucket = self.rate_limiter.bucket_for(url)
+
+        for attempt in range(API_MAX_RETRIES + 1):
+            if not bucket.acquire(is_cancelled):
+                check_cancelled()
+            response = self.session.request(method, url, **kwargs)
+
+            if response.status_code != 429:
+                bucket.on_success()
+                return response
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"), default=2 ** attempt)
+            bucket.on_rate_limited(retry_after)
+            if attempt < API_MAX_RETRIES:
+                print(f"⚠️ Rate limit ({bucket.name}) - {retry_after:.0f}s sonra tekrar denenecek")
+
+        return response
+
     def get_match_id(self, puuid: str) -> Optional[str]:
         """
         Oyuncunun aktif maç ID'sini alır
@@ -48,10 +92,9 @@ class RiotAPI:
             str: Match ID veya None (oyunda değilse)
         """
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f'https://glz-{self.region}-1.{self.shard}.a.pvp.net/core-game/v1/players/{puuid}',
-                headers=self.headers,
-                verify=False,
                 timeout=5
             )
 
@@ -66,6 +109,49 @@ class RiotAPI:
         except Exception:
             return None
 
+    def get_pregame_match_id(self, puuid: str) -> Optional[str]:
+        """
+        Oyuncunun ajan seçimindeki (pregame) maç ID'sini alır
+        Valapidocs: GET /pregame/v1/players/{puuid}
+        Args:
+            puuid: Player PUUID
+        Returns:
+            str: Pregame match ID veya None (ajan seçiminde değilse)
+        """
+        try:
+            response = self._request(
+                'GET',
+                f'https://glz-{self.region}-1.{self.shard}.a.pvp.net/pregame/v1/players/{puuid}',
+                timeout=5
+            )
+            response.raise_for_status()
+            return response.json().get("MatchID")
+
+        except Exception:
+            return None
+
+    def get_pregame_match(self, match_id: str) -> Optional[Dict]:
+        """
+        Ajan seçimi maç bilgilerini alır (takım oyuncuları)
+        Valapidocs: GET /pregame/v1/matches/{match_id}
+        Args:
+            match_id: Pregame match ID
+        Returns:
+            dict: Pregame match veya None
+        """
+        try:
+            response = self._request(
+                'GET',
+                f'https://glz-{self.region}-1.{self.shard}.a.pvp.net/pregame/v1/matches/{match_id}',
+                timeout=5
+            )
+            response.raise_for_status()
+            return response.json()
+
+        except Exception as e:
+            print(f"Ajan seçimi bilgileri alma hatası: {e}")
+            return None
+
     def get_match_details(self, match_id: str) -> Optional[Dict]:
         """
         Maç detaylarını alır
@@ -75,10 +161,10 @@ class RiotAPI:
             dict: Match details veya None
         """
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f'https://glz-{self.region}-1.{self.shard}.a.pvp.net/core-game/v1/matches/{match_id}',
-                headers=self.headers,
-                verify=False
+                timeout=5
             )
             response.raise_for_status()
             return response.json()
@@ -96,10 +182,10 @@ class RiotAPI:
             dict: Loadouts veya None
         """
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f'https://glz-{self.region}-1.{self.shard}.a.pvp.net/core-game/v1/matches/{match_id}/loadouts',
-                headers=self.headers,
-                verify=False
+                timeout=10
             )
             response.raise_for_status()
             loadouts_data = response.json()
@@ -149,21 +235,37 @@ class RiotAPI:
 
     def get_player_names(self, puuids: List[str]) -> Optional[List[Dict]]:
         """
-        Oyuncu isimlerini alır
+        Oyuncu isimlerini alır (cache kullanır, sadece eksik PUUID'ler istenir)
         Args:
             puuids: Player PUUID listesi
         Returns:
             list: Oyuncu isimleri veya None
         """
+        player_names = []
+        missing_puuids = []
+        for puuid in puuids:
+            cached_name = cache.get('player_names', puuid)
+            if cached_name:
+                player_names.append(cached_name)
+            else:
+                missing_puuids.append(puuid)
+
+        if not missing_puuids:
+            return player_names
+
         try:
-            response = requests.put(
+            response = self._request(
+                'PUT',
                 f'https://pd.{self.shard}.a.pvp.net/name-service/v2/players',
-                headers=self.headers,
-                json=puuids,
-                verify=False
+                json=missing_puuids
             )
             response.raise_for_status()
-            return response.json()
+
+            for name_data in response.json():
+                cache.set('player_names', name_data.get("Subject", ""), name_data)
+                player_names.append(name_data)
+
+            return player_names
 
         except Exception as e:
             print(f"Oyuncu isimleri alma hatası: {e}")
@@ -177,15 +279,20 @@ class RiotAPI:
         Returns:
             dict: Rank bilgisi veya None
         """
-        cached_rank = cache.get('ranks', puuid)
-        if cached_rank:
-            return cached_rank
+        return cache.get_or_compute('ranks', puuid, lambda: self._fetch_player_rank(puuid))
 
+    def _fetch_player_rank(self, puuid: str) -> Optional[Dict]:
+        """
+        Oyuncu rank bilgisini MMR endpoint'inden alır
+        Args:
+            puuid: Player PUUID
+        Returns:
+            dict: Rank bilgisi veya None
+        """
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f'https://pd.{self.shard}.a.pvp.net/mmr/v1/players/{puuid}',
-                headers=self.headers,
-                verify=False,
                 timeout=10
             )
 
@@ -194,11 +301,7 @@ class RiotAPI:
                 return None
 
             response.raise_for_status()
-            rank_data = response.json()
-
-            cache.set('ranks', puuid, rank_data)
-
-            return rank_data
+            return response.json()
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
@@ -214,15 +317,18 @@ class RiotAPI:
         Returns:
             str: Season ID veya None
         """
-        cached_season = cache.get('season_info', self.shard)
-        if cached_season:
-            return cached_season
+        return cache.get_or_compute('season_info', self.shard, self._fetch_current_season)
 
+    def _fetch_current_season(self) -> Optional[str]:
+        """
+        Aktif sezon ID'sini content endpoint'inden alır
+        Returns:
+            str: Season ID veya None
+        """
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f'https://shared.{self.shard}.a.pvp.net/content-service/v3/content',
-                headers=self.headers,
-                verify=False,
                 timeout=10
             )
             response.raise_for_status()
@@ -234,9 +340,6 @@ class RiotAPI:
                     season_id = season.get("ID")
                     break
 
-            if season_id:
-                cache.set('season_info', self.shard, season_id)
-
             return season_id
 
         except Exception as e:
@@ -245,7 +348,8 @@ class RiotAPI:
 
     def get_match_history(self, puuid: str, start_index: int = 0, end_index: int = 5, queue: str = "competitive") -> Optional[Dict]:
         """
-        Oyuncunun maç geçmişini alır (cache kullanır)
+        Oyuncunun maç geçmişini alır
+        Aralıklar oyuncu/kuyruk başına tek pencereden cevaplanır (0-15 alındıysa 0-5 için istek atılmaz)
         Args:
             puuid: Player PUUID
             start_index: Başlangıç indeksi (varsayılan 0)
@@ -254,31 +358,32 @@ class RiotAPI:
         Returns:
             dict: Match history veya None
         """
-        # Cache key oluştur
-        cache_key = f"{puuid}_{start_index}_{end_index}_{queue}"
-        cached_history = cache.get('match_history', cache_key)
-        if cached_history:
-            return cached_history
+        return self.history_store.get(puuid, start_index, end_index, queue)
 
+    def _fetch_match_history(self, puuid: str, start_index: int, end_index: int, queue: str) -> Optional[Dict]:
+        """
+        Oyuncunun maç geçmişini match-history endpoint'inden alır
+        Args:
+            puuid: Player PUUID
+            start_index: Başlangıç indeksi
+            end_index: Bitiş indeksi
+            queue: Kuyruk tipi
+        Returns:
+            dict: Match history veya None
+        """
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f'https://pd.{self.shard}.a.pvp.net/match-history/v1/history/{puuid}',
                 params={
                     'startIndex': start_index,
                     'endIndex': end_index,
                     'queue': queue
                 },
-                headers=self.headers,
-                verify=False,
                 timeout=10
             )
             response.raise_for_status()
-            history_data = response.json()
-
-            # Cache'e kaydet
-            cache.set('match_history', cache_key, history_data)
-
-            return history_data
+            return response.json()
 
         except Exception as e:
             print(f"Maç geçmişi alma hatası: {e}")
@@ -286,22 +391,49 @@ class RiotAPI:
 
     def get_completed_match_details(self, match_id: str) -> Optional[Dict]:
         """
-        Tamamlanmış maç detaylarını alır (istatistikler dahil, cache kullanır)
+        Tamamlanmış maç detaylarını alır (istatistikler dahil)
+        Sıra: bellek cache -> disk cache -> ağ (tamamlanmış maçlar değişmez, diskte kalıcı saklanır)
+        Bellekte ham veri kısa süre tutulur; uzun süreli kopya services.match_summary özetidir.
         Args:
             match_id: Match ID
         Returns:
             dict: Match details veya None
         """
-        # Cache'de var mı kontrol et
-        cached_details = cache.get('completed_match_details', match_id)
-        if cached_details:
-            return cached_details
+        return cache.get_or_compute(
+            'completed_match_details', match_id,
+            lambda: self._load_completed_match_details(match_id)
+        )
+
+    def _load_completed_match_details(self, match_id: str) -> Optional[Dict]:
+        """
+        Maç detayını diskten, yoksa ağdan alır ve diske yazar
+        Args:
+            match_id: Match ID
+        Returns:
+            dict: Match details veya None
+        """
+        match_data = disk_cache.get(match_id)
+        if match_data:
+            return match_data
+
+        match_data = self._fetch_completed_match_details(match_id)
+        if match_data:
+            disk_cache.set(match_id, match_data)
+
+        return match_data
 
+    def _fetch_completed_match_details(self, match_id: str) -> Optional[Dict]:
+        """
+        Tamamlanmış maç detaylarını match-details endpoint'inden alır
+        Args:
+            match_id: Match ID
+        Returns:
+            dict: Match details veya None
+        """
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f'https://pd.{self.shard}.a.pvp.net/match-details/v1/matches/{match_id}',
-                headers=self.headers,
-                verify=False,
                 timeout=10
             )
 
@@ -310,12 +442,7 @@ class RiotAPI:
                 return None
 
             response.raise_for_status()
-            match_data = response.json()
-
-            # Cache'e kaydet
-            cache.set('completed_match_details', match_id, match_data)
-
-            return match_data
+            return response.json()
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429:
@@ -0,0 +1,119 @@
+"""
+HTTP Handshake Benchmark
+Bir lobi için atılan istekleri yerel HTTPS sunucusuna karşı çalıştırır ve
+bare requests.get ile havuzlu session arasındaki TLS handshake sayısını karşılaştırır
+
+Kullanım: python benchmarks/http_handshakes.py
+(openssl komutu gerekir - self-signed sertifika üretmek için)
+"""
+import os
+import ssl
+import sys
+import time
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http import create_session
+
+try:
+    import urllib3
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+except (ImportError, AttributeError):
+    pass
+
+# Bir lobi: match id, details, loadouts, isimler, sezon, 10 rank, 10 history, ~40 maç detayı
+LOBBY_PATHS = (
+    ["/core-game/v1/players/self", "/core-game/v1/matches/m", "/core-game/v1/matches/m/loadouts",
+     "/name-service/v2/players", "/content-service/v3/content"]
+    + [f"/mmr/v1/players/p{i}" for i in range(10)]
+    + [f"/match-history/v1/history/p{i}" for i in range(10)]
+    + [f"/match-details/v1/matches/m{i}" for i in range(40)]
+)
+WORKERS = 10
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Kabul edilen her bağlantıyı (= bir TLS handshake) sayan HTTPS sunucusu"""
+    daemon_threads = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.handshakes = 0
+        self._count_lock = threading.Lock()
+
+    def verify_request(self, request, client_address):
+        with self._count_lock:
+            self.handshakes += 1
+        return True
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(cert_dir: str) -> StandInServer:
+    cert = os.path.join(cert_dir, "cert.pem")
+    key = os.path.join(cert_dir, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+
+    server = StandInServer(("127.0.0.1", 0), Handler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_lobby(server: StandInServer, get) -> tuple:
+    base = f"https://127.0.0.1:{server.server_address[1]}"
+    server.handshakes = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        list(executor.map(lambda path: get(base + path).raise_for_status(), LOBBY_PATHS))
+    return server.handshakes, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cert_dir:
+        server = start_server(cert_dir)
+
+        bare = run_lobby(server, lambda url: requests.get(url, verify=False, timeout=10))
+        session = create_session(verify=False)
+        pooled = run_lobby(server, session.get)
+        warm = run_lobby(server, session.get)
+
+        server.shutdown()
+
+    print(f"{len(LOBBY_PATHS)} istek / lobi, {WORKERS} worker")
+    print(f"{'mod':<22}{'handshake':>10}{'süre (ms)':>12}")
+    for name, (handshakes, elapsed) in [("bare requests.get", bare),
+                                        ("havuzlu session", pooled),
+                                        ("havuzlu session (2.)", warm)]:
+        print(f"{name:<22}{handshakes:>10}{elapsed * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
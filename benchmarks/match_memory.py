@@ -0,0 +1,185 @@
+"""
+Match Memory Benchmark
+Gerçek match-details şemasında üretilen maçların bellekte ham JSON olarak ve
+MatchSummary (kompakt özet) olarak kapladığı byte'ları karşılaştırır
+
+Kullanım: python benchmarks/match_memory.py [maç sayısı]
+"""
+import os
+import sys
+import json
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.match_summary import build_match_summary
+
+MATCH_COUNT = 50
+ROUNDS = 24
+TEAMS = ("Red", "Blue")
+WEAPONS = [f"{i:08x}-4f4b-4b4c-9e0c-{i:012x}" for i in range(18)]
+
+
+def _uuid(rng: random.Random) -> str:
+    return "%08x-%04x-%04x-%04x-%012x" % (
+        rng.getrandbits(32), rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(16), rng.getrandbits(48)
+    )
+
+
+def _location(rng: random.Random) -> dict:
+    return {"x": rng.randint(-9000, 9000), "y": rng.randint(-9000, 9000)}
+
+
+def _player_locations(rng: random.Random, puuids: list) -> list:
+    return [
+        {"subject": puuid, "viewRadians": rng.uniform(0, 6.28), "location": _location(rng)}
+        for puuid in puuids
+    ]
+
+
+def make_match_details(seed: int) -> dict:
+    """
+    match-details/v1/matches endpoint'inin yapısında (tüm alanlarıyla) sentetik bir maç üretir
+    Args:
+        seed: Rastgelelik tohumu
+    Returns:
+        dict: Ham match details
+    """
+    rng = random.Random(seed)
+    puuids = [_uuid(rng) for _ in range(10)]
+    team_of = {puuid: TEAMS[i % 2] for i, puuid in enumerate(puuids)}
+    start = 1700000000000 + seed * 3600000
+
+    round_results = []
+    kill_counts = dict.fromkeys(puuids, 0)
+    death_counts = dict.fromkeys(puuids, 0)
+    for round_num in range(ROUNDS):
+        kills = []
+        victims = rng.sample(puuids, rng.randint(3, 8))
+        for victim in victims:
+            killer = rng.choice([p for p in puuids if team_of[p] != team_of[victim]])
+            kill_counts[killer] += 1
+            death_counts[victim] += 1
+            kills.append({
+                "gameTime": rng.randint(0, 2400000), "roundTime": rng.randint(0, 100000),
+                "killer": killer, "victim": victim, "victimLocation": _location(rng),
+                "assistants": rng.sample(puuids, rng.randint(0, 2)),
+                "playerLocations": _player_locations(rng, puuids),
+                "finishingDamage": {"damageType": "Weapon", "damageItem": rng.choice(WEAPONS), "isSecondaryFireMode": False}
+            })
+
+        player_stats = []
+        for puuid in puuids:
+            player_kills = [kill for kill in kills if kill["killer"] == puuid]
+            player_stats.append({
+                "subject": puuid,
+                "kills": player_kills,
+                "damage": [
+                    {"receiver": receiver, "damage": rng.randint(20, 160),
+                     "legshots": rng.randint(0, 1), "bodyshots": rng.randint(0, 4), "headshots": rng.randint(0, 2)}
+                    for receiver in rng.sample(puuids, rng.randint(0, 3))
+                ],
+                "score": rng.randint(0, 800),
+                "economy": {"loadoutValue": rng.randint(800, 5000), "weapon": rng.choice(WEAPONS),
+                            "armor": rng.choice(WEAPONS), "remaining": rng.randint(0, 9000), "spent": rng.randint(0, 5000)},
+                "ability": {"grenadeEffects": None, "ability1Effects": None, "ability2Effects": None, "ultimateEffects": None},
+                "wasAfk": False, "wasPenalized": False, "stayedInSpawn": False
+            })
+
+        planted = rng.random() < 0.6
+        round_results.append({
+            "roundNum": round_num,
+            "roundResult": "Eliminated",
+            "roundCeremony": "CeremonyDefault",
+            "winningTeam": rng.choice(TEAMS),
+            "bombPlanter": rng.choice(puuids) if planted else None,
+            "bombDefuser": None,
+            "plantRoundTime": rng.randint(20000, 90000) if planted else 0,
+            "plantPlayerLocations": _player_locations(rng, puuids) if planted else None,
+            "plantLocation": _location(rng),
+            "plantSite": rng.choice("ABC") if planted else "",
+            "defuseRoundTime": 0,
+            "defusePlayerLocations": None,
+            "defuseLocation": {"x": 0, "y": 0},
+            "playerStats": player_stats,
+            "roundResultCode": rng.choice(["Elimination", "Detonate", "Defused"] if planted else ["Elimination"]),
+            "playerEconomies": [
+                {"subject": puuid, "loadoutValue": rng.randint(800, 5000), "weapon": rng.choice(WEAPONS),
+                 "armor": rng.choice(WEAPONS), "remaining": rng.randint(0, 9000), "spent": rng.randint(0, 5000)}
+                for puuid in puuids
+            ],
+            "playerScores": [{"subject": puuid, "score": rng.randint(0, 800)} for puuid in puuids]
+        })
+
+    players = [
+        {
+            "subject": puuid, "gameName": f"Player{i}", "tagLine": f"{rng.randint(1000, 9999)}",
+            "platformInfo": {"platformType": "PC", "platformOS": "Windows", "platformOSVersion": "10.0.19045.1.256.64bit", "platformChipset": "Unknown"},
+            "teamId": team_of[puuid], "partyId": _uuid(rng), "characterId": _uuid(rng),
+            "stats": {"score": rng.randint(2000, 8000), "roundsPlayed": ROUNDS, "kills": kill_counts[puuid],
+                      "deaths": death_counts[puuid], "assists": rng.randint(0, 12), "playtimeMillis": 2400000,
+                      "abilityCasts": {"grenadeCasts": rng.randint(0, 30), "ability1Casts": rng.randint(0, 30),
+                                       "ability2Casts": rng.randint(0, 30), "ultimateCasts": rng.randint(0, 5)}},
+            "roundDamage": [{"round": r, "receiver": rng.choice(puuids), "damage": rng.randint(0, 150)} for r in range(ROUNDS)],
+            "competitiveTier": rng.randint(3, 27), "isObserver": False, "playerCard": _uuid(rng), "playerTitle": _uuid(rng),
+            "preferredLevelBorder": _uuid(rng), "accountLevel": rng.randint(1, 400), "sessionPlaytimeMinutes": rng.randint(10, 300),
+            "behaviorFactors": {"afkRounds": 0, "collisions": rng.random(), "damageParticipationOutgoing": rng.randint(0, 4000),
+                                "friendlyFireIncoming": 0, "friendlyFireOutgoing": 0, "mouseMovement": rng.randint(0, 9999),
+                                "stayedInSpawnRounds": 0},
+            "newPlayerExperienceDetails": {"basicMovement": {"idleTimeMillis": 0, "objectiveCompleteTimeMillis": 0}}
+        }
+        for i, puuid in enumerate(puuids)
+    ]
+
+    return {
+        "matchInfo": {
+            "matchId": _uuid(rng), "mapId": rng.choice(["/Game/Maps/Ascent/Ascent", "/Game/Maps/Bonsai/Bonsai", "/Game/Maps/Pitt/Pitt"]),
+            "gamePodId": "aresriot.aws-rclusterprod-euc1-1.eu-gp-frankfurt-1", "gameLoopZone": "", "gameServerAddress": "",
+            "gameVersion": "release-09.08-shipping-18-2826542", "gameLengthMillis": 2400000, "gameStartMillis": start,
+            "provisioningFlowID": "Matchmaking", "isCompleted": True, "customGameName": "", "forceSkipTutorial": False,
+            "queueID": "competitive", "gameMode": "/Game/GameModes/Bomb/BombGameMode.BombGameMode_C", "isRanked": True,
+            "isMatchSampled": False, "seasonId": _uuid(rng), "completionState": "Completed", "platformType": "PC",
+            "partyRRPenalties": {}, "shouldMatchDisablePenalties": False
+        },
+        "players": players,
+        "bots": [],
+        "coaches": [],
+        "teams": [
+            {"teamId": team, "won": team == "Red", "roundsPlayed": ROUNDS, "roundsWon": ROUNDS // 2, "numPoints": ROUNDS // 2}
+            for team in TEAMS
+        ],
+        "roundResults": round_results,
+        "kills": [kill for round_data in round_results for kill in round_data["playerStats"][0]["kills"]]
+    }
+
+
+def measure(build) -> int:
+    """build() çıktısının canlı tuttuğu byte sayısı (tracemalloc)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def main():
+    match_count = int(sys.argv[1]) if len(sys.argv) > 1 else MATCH_COUNT
+
+    # Fixture'lar bir kez üretilip JSON'a çevrilir (cache'e ağdan/diskten gelen hali)
+    payloads = [json.dumps(make_match_details(seed)).encode() for seed in range(match_count)]
+    avg_payload = sum(len(payload) for payload in payloads) / match_count
+
+    raw_bytes = measure(lambda: [json.loads(payload) for payload in payloads])
+    summary_bytes = measure(lambda: [build_match_summary(json.loads(payload)) for payload in payloads])
+
+    print(f"{match_count} maç, ortalama JSON boyutu: {avg_payload / 1024:.1f} KB")
+    print(f"  Ham JSON (dict)    : {raw_bytes / match_count / 1024:8.1f} KB / maç")
+    print(f"  MatchSummary       : {summary_bytes / match_count / 1024:8.1f} KB / maç")
+    print(f"  Oran               : {raw_bytes / max(summary_bytes, 1):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
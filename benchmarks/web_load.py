@@ -0,0 +1,205 @@
+"""
+Web Load Benchmark
+Dashboard endpoint'lerini (/api/game, /api/vandal-skins) yerel sunucuya karşı eşzamanlı istemcilerle yükler;
+Werkzeug development server ile WebServer'ın saniyedeki istek sayısını ve p50/p99 gecikmesini karşılaştırır
+Yük süresince açık dashboard'ları temsil eden SSE stream'leri de açık tutulur
+
+Kullanım: python benchmarks/web_load.py [istemci sayısı] [endpoint başına süre (saniye)] [açık SSE stream sayısı]
+(skin ve oyun verisi sentetiktir, valorant-api.com'a istek atılmaz; sunucu ayrı process'te çalışır,
+yük üreten istemciler ölçülen sunucuyla GIL paylaşmaz)
+"""
+import os
+import sys
+import time
+import logging
+import threading
+import http.client
+import multiprocessing
+
+from werkzeug.serving import make_server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import web.app as web_app
+from web.server import WebServer
+
+CLIENTS = 16
+DURATION = 5.0
+STREAMS = 8
+ENDPOINTS = ["/api/game", "/api/vandal-skins"]
+SKIN_COUNT = 180
+
+
+def seed_data():
+    """Sentetik Vandal skinleri ve 10 oyunculu bir maç snapshot'ı yükler"""
+    web_app._vandal_skins_cache = {
+        f"{i:08x}-0000-0000-0000-{i:012x}": {
+            "displayName": f"Vandal Skin {i}",
+            "displayIcon": f"https://media.valorant-api.com/weaponskins/{i:08x}/displayicon.png",
+            "themeUuid": f"{i:08x}-1111-1111-1111-{i:012x}",
+            "contentTierUuid": "60bca009-4182-7998-dee7-b8a2558dc369",
+            "wallpaper": None
+        }
+        for i in range(SKIN_COUNT)
+    }
+    web_app.set_game_data({
+        "match_id": "b5a3d6d4-0c4f-4b4c-9e0c-3c2b7f1a9e11",
+        "stage": "complete",
+        "players": [
+            {
+                "puuid": f"{i:08x}-2222-2222-2222-{i:012x}",
+                "game_name": f"Player{i}",
+                "tag_line": "TR1",
+                "team_id": "Blue" if i < 5 else "Red",
+                "agent_name": "Jett",
+                "agent_uuid": "add6443a-41bd-e414-f6ad-e58d267f4e95",
+                "vandal_skin": f"Vandal Skin {i}",
+                "skin_uuid": f"{i:08x}-0000-0000-0000-{i:012x}",
+                "level": 100 + i,
+                "rank": "Elmas 2",
+                "kd": 1.23,
+                "hs_percentage": 24.5
+            }
+            for i in range(10)
+        ]
+    })
+
+
+def percentile(values: list, ratio: float) -> float:
+    """Sıralı listeden yüzdelik değer"""
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def load(port: int, path: str, clients: int, duration: float) -> dict:
+    """
+    Verilen süre boyunca her istemci art arda istek atar (sunucu bağlantıyı kapatırsa http.client yenisini açar;
+    istemci tarafı ölçümü bozmasın diye requests yerine http.client)
+    Returns:
+        dict: requests, errors, rps, p50_ms, p99_ms
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        local = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors += 1
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+            local.append(time.perf_counter() - started)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000
+    }
+
+
+def open_streams(port: int, count: int) -> list:
+    """
+    /api/game/stream'e bağlanıp ilk olayı okur, bağlantıları açık bırakır
+    Returns:
+        list: Açık bağlantılar (stream kabul edilmediyse de listededir)
+    """
+    connections = []
+    for _ in range(count):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("GET", "/api/game/stream")
+        response = connection.getresponse()
+        if response.status == 200:
+            response.fp.readline()
+        connections.append(connection)
+    return connections
+
+
+def serve(mode: str, ready, stop):
+    """
+    Sunucu process'i: veriyi yükler, sunucuyu başlatır, portu bildirir ve stop gelene kadar çalışır
+    Args:
+        mode: "development" (app.run(threaded=True) ile aynı, sınırsız bağlantı başına thread) veya "threaded"
+        ready: Port ve (kapanışta) kapanış süresinin gönderildiği pipe
+        stop: Kapanış sinyali
+    """
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    seed_data()
+
+    if mode == "development":
+        server = make_server("127.0.0.1", 0, web_app.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    else:
+        server = WebServer("127.0.0.1", 0, web_app.app)
+        server.start()
+
+    ready.send(server.server_port)
+    stop.wait()
+
+    started = time.perf_counter()
+    web_app.close_streams()
+    if mode == "development":
+        server.shutdown()
+        server.server_close()
+    else:
+        server.stop()
+    ready.send(time.perf_counter() - started)
+
+
+def run(name: str, mode: str, clients: int, duration: float, streams: int):
+    """Sunucuyu ayrı process'te başlatır, endpoint'leri yükler ve sonuçları yazdırır"""
+    parent, child = multiprocessing.Pipe()
+    stop = multiprocessing.Event()
+    process = multiprocessing.Process(target=serve, args=(mode, child, stop), daemon=True)
+    process.start()
+    port = parent.recv()
+
+    print(f"{name}")
+    held = open_streams(port, streams)
+    for path in ENDPOINTS:
+        result = load(port, path, clients, duration)
+        print(f"  {path:<18} {result['rps']:8.0f} req/s   p50 {result['p50_ms']:6.1f} ms   "
+              f"p99 {result['p99_ms']:6.1f} ms   ({result['requests']} istek, {result['errors']} hata)")
+
+    stop.set()
+    for connection in held:
+        connection.close()
+    print(f"  kapanış: {parent.recv() * 1000:.0f} ms\n")
+    process.join()
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else CLIENTS
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else DURATION
+    streams = int(sys.argv[3]) if len(sys.argv) > 3 else STREAMS
+
+    print(f"{clients} eşzamanlı istemci, {streams} açık SSE stream, endpoint başına {duration:.0f} sn\n")
+    run("Werkzeug development server", "development", clients, duration, streams)
+    run("WebServer", "threaded", clients, duration, streams)
+
+
+if __name__ == "__main__":
+    main()
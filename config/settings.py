@@ -8,10 +8,19 @@ SHARD = "eu"
 
 # Cache ayarları
 CACHE_DURATION = 300  # 5 dakika (saniye)
+DISK_CACHE_ENABLED = True  # tamamlanmış maç detayları diskte saklanır
+DISK_CACHE_MAX_BYTES = 200 * 1024 * 1024  # sıkıştırılmış toplam boyut sınırı
 
 # WebSocket ayarları
 WS_RECONNECT_DELAY = 5  # saniye
 WS_TIMEOUT = 30  # saniye
+WS_PRESENCE_EVENT = "OnJsonApiEvent_chat_v4_presences"
+
+# Oyun algılama (sessionLoopState websocket'ten gelir, polling sadece yedek)
+STATE_FALLBACK_POLL_INTERVAL = 60  # websocket bağlıyken yedek kontrol aralığı (saniye)
+GAME_POLL_INTERVAL = 25  # websocket bağlı değilken kontrol aralığı (saniye)
+INGAME_RETRY_DELAY = 3  # INGAME olup maç henüz bulunamadıysa tekrar deneme (saniye)
+INGAME_REFRESH_INTERVAL = 15  # maç sırasında değişen oyuncuların kontrolü (değişiklik yoksa sadece core-game istekleri)
 
 # API URL'leri
 VALORANT_API_BASE = "https://valorant-api.com/v1"
@@ -21,5 +30,36 @@ VALORANT_API_LANGUAGE = "tr-TR"
 VANDAL_UUID = "9c82e19d-4575-0200-1a81-3eacf00cf872"
 VANDAL_SOCKET_ID = "bcef87d6-209b-46c6-8b19-fbe40bd95abc"
 
-# Rate limiting
-API_REQUEST_DELAY = 2.0  # saniye
+# Rate limiting (host grubu: (saniyede istek, anlık patlama kapasitesi))
+# 429 alınınca ilgili grubun hızı yarıya iner, başarılı isteklerle tekrar yükselir
+API_RATE_LIMITS = {
+    "glz": (4.0, 8),
+    "pd": (8.0, 16),
+    "shared": (2.0, 4),
+    "default": (4.0, 8),
+}
+API_MAX_RETRIES = 3  # 429 sonrası Retry-After beklenip tekrar denenir
+
+# HTTP bağlantı havuzu (keep-alive)
+HTTP_POOL_CONNECTIONS = 4  # havuzda tutulan host sayısı
+HTTP_POOL_MAXSIZE = 10  # host başına açık bağlantı (ENRICH_MAX_WORKERS ile uyumlu)
+HTTP_TIMEOUT = 10  # saniye (timeout verilmeyen istekler için)
+
+# Oyuncu bilgilerini eşzamanlı zenginleştirme
+ENRICH_MAX_WORKERS = 10
+# Bir maçın bilgi toplama işine verilen süre; maç bitince/değişince iş bu süreyi beklemeden iptal edilir
+ENRICH_DEADLINE = 60  # saniye
+# Aynı maçta rank/KD'si hata (rate limit, bağlantı) yüzünden alınamayan oyuncunun sonraki kontrollerde tekrar denenme sayısı
+ENRICH_MAX_RETRIES = 3
+
+# Web dashboard canlı güncelleme (Server-Sent Events)
+SSE_HEARTBEAT_INTERVAL = 15  # değişiklik yokken bağlantıyı canlı tutan yorum satırı aralığı (saniye)
+SSE_RETRY_MS = 3000  # bağlantı koparsa tarayıcının yeniden bağlanma beklemesi (milisaniye)
+SSE_DISCONNECT_CHECK_INTERVAL = 1  # kopan istemcinin stream'inin (ve thread'inin) en geç bırakılma süresi (saniye)
+SSE_MAX_STREAMS = 32  # aynı anda açık stream (her biri bir sunucu thread'i tutar, WEB_SERVER_THREADS'ten küçük olmalı)
+WEB_GZIP_MIN_SIZE = 1024  # bu boyuttan (byte) büyük /api/game cevapları gzip'li olarak da hazırlanır
+
+# Web sunucusu (thread'li WSGI sunucusu)
+WEB_SERVER_THREADS = 64  # aynı anda işlenen bağlantı (bağlantı başına thread; açık SSE stream'leri dahil)
+WEB_REQUEST_TIMEOUT = 10  # isteğini göndermeyen/cevabını okumayan bağlantının kapatılma süresi (saniye)
+WEB_SHUTDOWN_TIMEOUT = 5  # kapanışta süren isteklerin bekleneceği maksimum süre (saniye)
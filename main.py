@@ -2,8 +2,6 @@ import os
 import sys
 import time
 import asyncio
-import threading
-import requests
 from rich.console import Console
 
 from api.local_client import LocalValorantClient
@@ -12,6 +10,10 @@ from services.valorant_api import ValorantAPIService
 from services.game_service import GameService
 from utils.display import print_ascii_art, print_status, create_player_table
 from utils.colors import Colors
+from utils.snapshot import game_snapshot, make_game_snapshot
+from config.settings import (
+    WS_PRESENCE_EVENT, STATE_FALLBACK_POLL_INTERVAL, GAME_POLL_INTERVAL, INGAME_RETRY_DELAY, INGAME_REFRESH_INTERVAL
+)
 
 console = Console()
 
@@ -28,44 +30,51 @@ class ValorantTracker:
         self.game_service = None
         self.previous_match_id = None
         self.websocket_task = None
-        self.web_server_thread = None
+        self.web_server = None
+        self.session_state = None
+        self.state_changed = asyncio.Event()
+        self.pregame_task = None
 
     def start_web_server(self):
-        """Web sunucusunu ayrı bir thread'de başlat"""
+        """Web sunucusunu (thread'li WSGI sunucusu) arka planda başlat"""
         if not WEB_SERVER_ENABLED:
             return
 
-        def run_server():
-            try:
-                from web.app import app, set_riot_api
-                import logging
-                log = logging.getLogger('werkzeug')
-                log.setLevel(logging.ERROR)
-
-                # RiotAPI instance'ını web servisine aktar
-                if self.riot_api:
-                    set_riot_api(self.riot_api)
-
-                app.run(host='0.0.0.0', port=WEB_SERVER_PORT, debug=False, use_reloader=False)
-            except Exception:
-                pass
+        try:
+            from web.app import app, set_riot_api, set_valorant_api
+            from web.server import WebServer
+            import logging
+            log = logging.getLogger('werkzeug')
+            log.setLevel(logging.ERROR)
+
+            # RiotAPI ve ValorantAPI instance'larını (bağlantı havuzlarıyla) web servisine aktar
+            set_valorant_api(self.valorant_api)
+            if self.riot_api:
+                set_riot_api(self.riot_api)
+
+            self.web_server = WebServer('0.0.0.0', WEB_SERVER_PORT, app)
+            self.web_server.start()
+        except (Exception, SystemExit):
+            # Port kullanımdaysa Werkzeug sys.exit(1) çağırır; tracker web sunucusu olmadan devam eder
+            self.web_server = None
+
+    def stop_web_server(self):
+        """Açık stream'leri bitirir ve web sunucusunu süren istekleri bekleyerek kapatır"""
+        if not self.web_server:
+            return
 
-        self.web_server_thread = threading.Thread(target=run_server, daemon=True)
-        self.web_server_thread.start()
+        from web.app import close_streams
+        close_streams()
+        self.web_server.stop()
+        self.web_server = None
 
     def send_to_web(self, game_info: dict):
-        """Oyun bilgilerini web sunucusuna gönder"""
+        """Oyun bilgilerini web sunucusuyla paylaş (aynı process: JSON/HTTP yok, snapshot slot'a konur)"""
         if not WEB_SERVER_ENABLED:
             return
-        
-        try:
-            requests.post(
-                f'http://localhost:{WEB_SERVER_PORT}/api/game/update',
-                json=game_info,
-                timeout=2
-            )
-        except Exception:
-            pass  # Web sunucusu henüz hazır değilse sessizce geç
+
+        # Web sunucusu henüz başlamadıysa da snapshot hazır bekler
+        game_snapshot.publish(make_game_snapshot(game_info))
 
     async def initialize(self) -> bool:
         if not self.local_client.read_lockfile():
@@ -92,61 +101,143 @@ class ValorantTracker:
 
         return True
 
-    async def websocket_message_handler(self, data: dict):
+    async def websocket_message_handler(self, data: list):
         """
-        WebSocket mesajlarını işler
+        WebSocket mesajlarını işler (presence event'lerinden sessionLoopState geçişleri)
         Args:
-            data: WebSocket mesajı
+            data: WebSocket mesajı [opcode, event, payload]
         """
-        pass
+        if not isinstance(data, list) or len(data) < 3 or data[1] != WS_PRESENCE_EVENT:
+            return
+
+        payload = data[2] if isinstance(data[2], dict) else {}
+        for presence in payload.get("data", {}).get("presences", []):
+            if presence.get("puuid") == self.local_client.puuid:
+                self.set_session_state(self.local_client.parse_session_state(presence))
+                break
+
+    def set_session_state(self, state: str):
+        """
+        sessionLoopState değiştiyse monitor döngüsünü uyandırır
+        Args:
+            state: MENUS, PREGAME, INGAME
+        """
+        if state and state != self.session_state:
+            # Lobiye dönüldüyse (maç bitti/dodge) yarım kalan bilgi toplama işi bırakılır
+            if state == "MENUS" and self.game_service:
+                self.game_service.cancel_run("lobiye dönüldü")
+            self.session_state = state
+            self.state_changed.set()
+
+    def get_poll_interval(self) -> float:
+        """Websocket bağlıyken polling sadece yedek olarak çalışır (maç sırasında değişen oyuncular için daha sık)"""
+        if self.session_state == "INGAME":
+            return INGAME_REFRESH_INTERVAL
+        if self.local_client.websocket_connected:
+            return STATE_FALLBACK_POLL_INTERVAL
+        return GAME_POLL_INTERVAL
+
+    async def wait_for_state_change(self, timeout: float):
+        """
+        Durum değişikliğini veya yedek kontrol zamanını bekler
+        Args:
+            timeout: Maksimum bekleme süresi (saniye)
+        """
+        try:
+            await asyncio.wait_for(self.state_changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            # Yedek kontrol local presence endpoint'inden yapılır (Riot sunucularına istek atılmaz)
+            self.set_session_state(await asyncio.to_thread(self.local_client.get_session_state))
+
+    async def warm_up_pregame(self):
+        """Ajan seçimindeki oyuncuların verilerini arka planda hazırlar"""
+        try:
+            warmed = await self.game_service.warm_up_pregame(self.local_client.puuid)
+            if warmed and self.session_state == "PREGAME":
+                print_status(f"✅ {warmed} oyuncunun bilgileri hazır, maç bekleniyor...", status_type="success")
+        except Exception:
+            pass
+
+    def publish_game_info(self, game_info: dict):
+        """
+        Oyun bilgisini (ara aşama veya tamamı) terminale ve web'e yansıtır
+        Tamamı gösterilmiş maçta oyuncular değişmediyse ekran yeniden çizilmez.
+        Args:
+            game_info: get_full_game_info_async sonucu veya ara sonucu
+        """
+        if game_info["match_id"] == self.previous_match_id and not game_info.get("changed_players"):
+            return
+
+        print_status("🎮 Oyun bulundu!", clear_screen=True, status_type="success")
+        print()
+        console.print(create_player_table(game_info), justify="center")
+
+        # Web sunucusuna gönder
+        self.send_to_web(game_info)
+
+        if game_info.get("stage") == "complete":
+            self.previous_match_id = game_info["match_id"]
+
+    async def check_game(self) -> float:
+        """
+        Mevcut duruma göre oyunu kontrol eder ve ekranı günceller
+        Returns:
+            float: Bir sonraki kontrole kadar beklenecek süre (saniye)
+        """
+        if self.session_state == "PREGAME":
+            # Ajan seçimi: oyuncu verileri maç yüklenmeden önce cache'e alınır
+            if not self.pregame_task or self.pregame_task.done():
+                self.pregame_task = asyncio.create_task(self.warm_up_pregame())
+            print_status("🧩 Ajan seçimi - oyuncu bilgileri hazırlanıyor...", clear_screen=True, status_type="info")
+            return self.get_poll_interval()
+
+        # Ajan seçiminden çıkıldıysa (dodge) yarım kalan ön yükleme iptal edilir
+        if self.session_state != "INGAME" and self.pregame_task and not self.pregame_task.done():
+            self.pregame_task.cancel()
+
+        # sessionLoopState okunamadıysa core-game endpoint'i sorgulanır
+        if self.session_state in ["INGAME", None]:
+            game_info = await self.game_service.get_full_game_info_async(
+                self.local_client.puuid, on_update=self.publish_game_info
+            )
+
+            if game_info:
+                self.publish_game_info(game_info)
+                return self.get_poll_interval()
+
+            # Yükleme ekranında maç henüz görünmeyebilir
+            if self.session_state == "INGAME":
+                return INGAME_RETRY_DELAY
+
+        if self.previous_match_id:
+            print_status("🏁 Oyun bitti!", clear_screen=True, status_type="warning")
+            self.previous_match_id = None
+        else:
+            print_status("🔍 Oyun bekleniyor...", clear_screen=True, status_type="info")
+
+        return self.get_poll_interval()
 
     async def monitor_game(self):
-        """Oyun durumunu sürekli kontrol eder"""
+        """Oyun durumunu websocket event'leriyle takip eder (polling sadece yedek)"""
+        self.websocket_task = asyncio.create_task(
+            self.local_client.listen_websocket(self.websocket_message_handler, [WS_PRESENCE_EVENT])
+        )
+        self.session_state = await asyncio.to_thread(self.local_client.get_session_state)
+
         try:
             while True:
                 try:
-                    game_info = self.game_service.get_full_game_info(self.local_client.puuid)
-
-                    if game_info:
-                        current_match_id = game_info["match_id"]
-
-                        if current_match_id != self.previous_match_id:
-                            if self.websocket_task and not self.websocket_task.done():
-                                self.websocket_task.cancel()
-
-                            print_status("🎮 Oyun bulundu!", clear_screen=True, status_type="success")
-                            print()
-                            console.print(create_player_table(game_info), justify="center")
-                            
-                            # Web sunucusuna gönder
-                            self.send_to_web(game_info)
-
-                            self.previous_match_id = current_match_id
-
-                            self.websocket_task = asyncio.create_task(
-                                self.local_client.connect_websocket(self.websocket_message_handler)
-                            )
-                    else:
-                        if self.previous_match_id:
-                            print_status("🏁 Oyun bitti!", clear_screen=True, status_type="warning")
-                            if self.websocket_task and not self.websocket_task.done():
-                                self.websocket_task.cancel()
-                            self.previous_match_id = None
-                        else:
-                            print_status("🔍 Oyun bekleniyor...", clear_screen=True, status_type="info")
-
-                    await asyncio.sleep(25)
+                    self.state_changed.clear()
+                    timeout = await self.check_game()
+                    await self.wait_for_state_change(timeout)
 
                 except Exception:
                     await asyncio.sleep(5)
 
-        except KeyboardInterrupt:
-            if self.websocket_task and not self.websocket_task.done():
-                self.websocket_task.cancel()
-            raise
-        except asyncio.CancelledError:
-            if self.websocket_task and not self.websocket_task.done():
-                self.websocket_task.cancel()
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            for task in [self.websocket_task, self.pregame_task]:
+                if task and not task.done():
+                    task.cancel()
             raise
 
     async def run(self):
@@ -155,7 +246,11 @@ class ValorantTracker:
 
         if await self.initialize():
             self.start_web_server()
-            await self.monitor_game()
+            try:
+                await self.monitor_game()
+            finally:
+                # Tracker kapanırken (Ctrl+C) web sunucusu da düzgünce kapatılır
+                self.stop_web_server()
 
 
 def main():
@@ -2,11 +2,21 @@
 Game Service
 Oyun bilgilerini toplar ve dinamik olarak ajan/skin isimlerini eşleştirir
 """
-import time
-from typing import Optional, Dict, List, Tuple
+import asyncio
+from typing import Optional, Dict, List, Tuple, Callable
 from api.riot_api import RiotAPI
+from api.async_riot_api import AsyncRiotAPI
 from services.valorant_api import ValorantAPIService
+from services.player_stats_service import StatsUnavailable
 from utils.colors import Colors
+from utils.display import PENDING
+from utils.cancellation import CancellationToken, OperationCancelled, current_token, check_cancelled
+from config.settings import ENRICH_DEADLINE, ENRICH_MAX_RETRIES
+
+
+async def _resolved(value):
+    """Önceden bilinen değeri gather içinde istek yerine kullanmak için"""
+    return value
 
 
 def parse_rank(rank_data: Dict, current_season: str) -> str:
@@ -111,6 +121,7 @@ class GameService:
             valorant_api: ValorantAPIService instance
         """
         self.riot_api = riot_api
+        self.async_api = AsyncRiotAPI(riot_api)
         self.valorant_api = valorant_api
 
         # Cache için dinamik veriler
@@ -121,6 +132,40 @@ class GameService:
         from services.player_stats_service import PlayerStatsService
         self.player_stats_service = PlayerStatsService(riot_api)
 
+        # Devam eden bilgi toplama işinin (maç ID'sine bağlı) iptal token'ı
+        self._run_token: Optional[CancellationToken] = None
+
+        # Son tamamlanan maç bilgisi (aynı maçın sonraki kontrollerinde sadece değişen oyuncular istenir)
+        self._snapshot: Optional[Dict] = None
+
+    def _start_run(self, match_id: str) -> CancellationToken:
+        """
+        Maç için iptal token'ı döndürür; başka bir maçın işi sürüyorsa iptal edilir
+        Aynı maçın süresi dolmamış token'ı varsa (ajan seçimi -> oyun) o kullanılır.
+        Args:
+            match_id: Match ID
+        Returns:
+            CancellationToken: ENRICH_DEADLINE süreli token
+        """
+        token = self._run_token
+        if token and token.match_id == match_id and not token.cancelled:
+            return token
+
+        if token:
+            token.cancel(f"yeni maç {match_id}")
+        self._run_token = CancellationToken(match_id, ENRICH_DEADLINE)
+        return self._run_token
+
+    def cancel_run(self, reason: str = ""):
+        """
+        Devam eden bilgi toplama işini iptal eder (maç bitti/ajan seçiminden çıkıldı)
+        Kalan istekler atılmaz, rate limiter bütçesi sonraki maça kalır.
+        Args:
+            reason: Log için iptal nedeni
+        """
+        if self._run_token:
+            self._run_token.cancel(reason)
+
     def load_dynamic_data(self):
         """Ajan ve skin verilerini Valorant-API'den dinamik olarak yükler"""
         print("📥 Ajan ve skin verileri yükleniyor...")
@@ -129,57 +174,353 @@ class GameService:
         print(f"✅ {len(self._agents)} ajan, {len(self._skins)} Vandal skini yüklendi")
         print("💾 Cache aktif - rank bilgileri 15 dakika saklanır (rate limit önlemi)")
 
+    async def _fetch_rank(self, puuid: str) -> Tuple[Optional[Dict], Optional[Exception]]:
+        """
+        Rank verisini alır (hata oyuncu adıyla birlikte sonra raporlanır)
+        Args:
+            puuid: Player PUUID
+        Returns:
+            Tuple[dict, Exception]: (rank_data, hata)
+        """
+        try:
+            return await self.async_api.get_player_rank(puuid), None
+        except Exception as e:
+            return None, e
+
+    async def _fetch_kd_hs(self, puuids: List[str]) -> Dict[str, Tuple[Optional[Dict], Optional[Exception]]]:
+        """
+        Lobideki oyuncuların KD/HS istatistiklerini ortak maç kümesi üzerinden alır
+        Args:
+            puuids: Player PUUID listesi
+        Returns:
+            dict: {puuid: (stats, hata)}
+        """
+        try:
+            # İç istekler senkron RiotAPI'den geçer (rate limiter sınırlar); uzun süren bu iş
+            # AsyncRiotAPI'nin istek slotlarını meşgul etmesin diye ayrı thread'de çalışır
+            lobby_stats = await asyncio.to_thread(self.player_stats_service.get_lobby_kd_hs_stats, puuids, match_count=5)
+        except Exception as e:
+            return {puuid: (None, e) for puuid in puuids}
+
+        results = {}
+        for puuid in puuids:
+            stats = lobby_stats.get(puuid)
+            results[puuid] = (None, stats) if isinstance(stats, StatsUnavailable) else (stats, None)
+        return results
+
+    async def warm_up_pregame(self, puuid: str) -> int:
+        """
+        Ajan seçimi sırasında bilinen oyuncuların isim, rank ve KD/HS verilerini cache'e alır
+        Maç başladığında get_full_game_info_async bu oyuncular için cache'den cevaplanır
+        Args:
+            puuid: Player PUUID
+        Returns:
+            int: Verisi hazırlanan oyuncu sayısı
+        """
+        match_id = await self.async_api.get_pregame_match_id(puuid)
+        if not match_id:
+            return 0
+
+        pregame_match = await self.async_api.get_pregame_match(match_id)
+        if not pregame_match:
+            return 0
+
+        # Ajan seçiminde genelde sadece kendi takımımız görünür
+        player_puuids = []
+        for team_key in ["AllyTeam", "EnemyTeam"]:
+            team = pregame_match.get(team_key) or {}
+            player_puuids.extend(p["Subject"] for p in team.get("Players", []) if p.get("Subject"))
+
+        if not player_puuids:
+            return 0
+
+        context_token = current_token.set(self._start_run(match_id))
+        try:
+            await asyncio.gather(
+                self.async_api.get_player_names(player_puuids),
+                self.async_api.get_current_season(),
+                *(self._fetch_rank(p) for p in player_puuids),
+                self._fetch_kd_hs(player_puuids)
+            )
+        except OperationCancelled:
+            return 0
+        finally:
+            current_token.reset(context_token)
+
+        return len(player_puuids)
+
     def get_full_game_info(self, puuid: str) -> Optional[Dict]:
         """
-        Oyunun tüm bilgilerini toplar (match details, loadouts, player names, agents, skins)
+        get_full_game_info_async için senkron sarmalayıcı (event loop dışındaki çağıranlar için)
         Args:
             puuid: Player PUUID
         Returns:
             dict: Tüm oyun bilgileri veya None
         """
+        return asyncio.run(self.get_full_game_info_async(puuid))
+
+    async def get_full_game_info_async(self, puuid: str, on_update: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
+        """
+        Oyunun tüm bilgilerini toplar (match details, loadouts, player names, agents, skins)
+        Öncelik sırası: isim/ajan/seviye -> rank -> KD/HS. Rank ve KD/HS istekleri tüm oyuncular için
+        aynı anda başlatılır, hız sınırını RiotAPI'nin ortak rate limiter'ı belirler.
+        Her aşama bitince eksik alanları PENDING olan ara sonuç on_update'e verilir.
+        Args:
+            puuid: Player PUUID
+            on_update: Ara sonuçları (stage: basic/ranks/stats) alan fonksiyon
+        Returns:
+            dict: Tüm oyun bilgileri (stage: complete) veya None
+        """
         # Dinamik verileri yükle (ilk çağrıda)
         if self._agents is None or self._skins is None:
-            self.load_dynamic_data()
+            await asyncio.to_thread(self.load_dynamic_data)
 
         # Match ID al
-        match_id = self.riot_api.get_match_id(puuid)
+        match_id = await self.async_api.get_match_id(puuid)
         if not match_id:
             return None
 
+        # Bu maçın işi token'a bağlanır: maç biter/değişirse veya süre dolarsa kalan istekler atılmaz
+        context_token = current_token.set(self._start_run(match_id))
+        try:
+            return await self._collect_game_info(match_id, on_update)
+        except OperationCancelled as e:
+            print(f"⏹️ Maç bilgisi toplama iptal edildi ({e})")
+            return None
+        finally:
+            current_token.reset(context_token)
+
+    @staticmethod
+    def _player_fingerprint(player: Dict) -> Tuple:
+        """Core-game oyuncu verisinin yeniden zenginleştirme gerektiren alanları (takım, ajan, seviye)"""
+        player_identity = player.get("PlayerIdentity", {})
+        return (
+            player.get("TeamID"),
+            player.get("CharacterID"),
+            player_identity.get("AccountLevel"),
+            player_identity.get("HideAccountLevel")
+        )
+
+    async def _collect_game_info(self, match_id: str, on_update: Optional[Callable[[Dict], None]]) -> Optional[Dict]:
+        """
+        get_full_game_info_async'in maç ID'si alındıktan sonraki kısmı (token context'te)
+        Aynı maçın önceki sonucu varsa sadece yeni gelen veya ajanı/takımı/seviyesi değişen oyuncular
+        için istek atılır; hiçbir oyuncu değişmediyse core-game dışında istek atılmaz. Rank/KD'si hata
+        (rate limit, bağlantı) yüzünden alınamayan oyuncular en fazla ENRICH_MAX_RETRIES kez tekrar denenir.
+        Args:
+            match_id: Match ID
+            on_update: Ara sonuçları alan fonksiyon
+        Returns:
+            dict: Tüm oyun bilgileri (changed_players: değişen/ayrılan oyuncular) veya None
+        """
         # Match details al
-        match_details = self.riot_api.get_match_details(match_id)
+        match_details = await self.async_api.get_match_details(match_id)
         if not match_details:
             return None
 
-        # Loadouts al
-        loadouts = self.riot_api.get_match_loadouts(match_id)
-        if not loadouts:
-            return None
-
         # Oyuncu PUUID'lerini topla
         player_puuids = [player["Subject"] for player in match_details.get("Players", [])]
+        fingerprints = {player["Subject"]: self._player_fingerprint(player) for player in match_details.get("Players", [])}
 
-        # Oyuncu isimlerini al
-        player_names = self.riot_api.get_player_names(player_puuids)
-        if not player_names:
-            return None
+        previous = self._snapshot if self._snapshot and self._snapshot["match_id"] == match_id else None
+        if previous:
+            changed = [p for p in player_puuids if previous["fingerprints"].get(p) != fingerprints[p]]
+            left = [p for p in previous["fingerprints"] if p not in fingerprints]
 
-        # Aktif sezonu al (rank için gerekli)
-        current_season = self.riot_api.get_current_season()
+            # Sadece hatayla sonuçlanan istekler tekrar denenir; "?" kalıcı olabilir (rekabetçi maçı yok)
+            def retryable(failures: Dict[str, int]) -> List[str]:
+                return [p for p in player_puuids if p not in changed and 0 < failures.get(p, 0) <= ENRICH_MAX_RETRIES]
 
-        # Oyuncu bilgilerini zenginleştir
-        enriched_players = []
-        for idx, player in enumerate(match_details.get("Players", [])):
-            if idx > 0:
-                time.sleep(1)  # Rank API için delay
+            rank_retry = retryable(previous["rank_failures"])
+            stats_retry = retryable(previous["stats_failures"])
+        else:
+            changed = player_puuids
+            left = []
+            rank_retry = []
+            stats_retry = []
+
+        if previous and not (changed or rank_retry or stats_retry):
+            game_info = self._build_game_info(
+                match_id, match_details, previous["loadouts"], previous["names"],
+                previous["ranks"], previous["player_stats"], "complete"
+            )
+            game_info["changed_players"] = left
+            previous["fingerprints"] = fingerprints
+            return game_info
+
+        rank_fetch = changed + rank_retry
+        stats_fetch = changed + stats_retry
+
+        # Loadouts/isimler/sezon önce kuyruğa girer, rank ve KD/HS istekleri onlarla aynı anda ilerler
+        # (sadece tekrar deneme varsa loadouts ve isimler önceki sonuçtan alınır)
+        lookups = asyncio.gather(
+            self.async_api.get_match_loadouts(match_id) if changed else _resolved(previous["loadouts"]),
+            self.async_api.get_player_names(changed) if changed else _resolved([]),
+            self.async_api.get_current_season()
+        )
+        ranks_task = asyncio.gather(*(self._fetch_rank(p) for p in rank_fetch))
+        # Sadece rank tekrar deneniyorsa KD/HS için thread açılmaz
+        stats_task = asyncio.ensure_future(self._fetch_kd_hs(stats_fetch)) if stats_fetch else None
+
+        # Değişmeyen (ve tekrar denenen) oyuncuların değerleri önceki sonuçtan, değişenler gelene kadar PENDING
+        ranks = dict(previous["ranks"]) if previous else {}
+        player_stats = dict(previous["player_stats"]) if previous else {}
+        ranks.update((p, PENDING) for p in changed)
+        player_stats.update((p, (PENDING, PENDING)) for p in changed)
+        retried_shown = {p: (ranks[p], player_stats[p]) for p in dict.fromkeys(rank_retry + stats_retry)}
+
+        rank_failures = dict(previous["rank_failures"]) if previous else {}
+        stats_failures = dict(previous["stats_failures"]) if previous else {}
+
+        def publish(stage: str) -> Dict:
+            game_info = self._build_game_info(match_id, match_details, loadouts, names, ranks, player_stats, stage)
+            # Tekrar denenen oyuncu sadece gösterilen değeri değiştiyse bildirilir
+            retried = [p for p, shown in retried_shown.items() if (ranks[p], player_stats[p]) != shown]
+            game_info["changed_players"] = changed + retried + left
+            return game_info
+
+        def count_failures(failures: Dict[str, int], failed: Dict[str, bool]):
+            for player_puuid, player_failed in failed.items():
+                if player_failed:
+                    failures[player_puuid] = failures.get(player_puuid, 0) + 1
+                else:
+                    failures.pop(player_puuid, None)
+
+        for player_puuid in changed:
+            rank_failures.pop(player_puuid, None)
+            stats_failures.pop(player_puuid, None)
+
+        try:
+            loadouts, player_names, current_season = await lookups
+            if not loadouts or (changed and not player_names):
+                ranks_task.cancel()
+                if stats_task:
+                    stats_task.cancel()
+                return None
+
+            names = dict(previous["names"]) if previous else {}
+            names.update((p.get("Subject", ""), p) for p in player_names)
+
+            check_cancelled()
+            if on_update:
+                on_update(publish("basic"))
+
+            # Rank ve KD/HS hangisi önce biterse o aşama yayınlanır
+            pending = {task for task in (ranks_task, stats_task) if task}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if ranks_task in done:
+                    rank_results = dict(zip(rank_fetch, ranks_task.result()))
+                    # Her hesabın MMR kaydı vardır; RiotAPI istek hatalarını (429 dahil) None'a çevirir
+                    count_failures(rank_failures, {p: error is not None or data is None for p, (data, error) in rank_results.items()})
+                    ranks.update(self._format_ranks(rank_results, current_season, names))
+                if stats_task in done:
+                    # None rekabetçi maçı olmayan oyuncudur; sadece istek hataları (StatsUnavailable) tekrar denenir
+                    count_failures(stats_failures, {p: error is not None for p, (_, error) in stats_task.result().items()})
+                    player_stats.update(self._format_kd_hs(stats_task.result(), names))
+
+                check_cancelled()
+                if pending and on_update:
+                    on_update(publish("ranks" if ranks_task in done else "stats"))
+
+        except BaseException:
+            # İptal/hata: diğer aşamanın sonucu beklenmez
+            lookups.cancel()
+            ranks_task.cancel()
+            if stats_task:
+                stats_task.cancel()
+            raise
+
+        self._snapshot = {
+            "match_id": match_id,
+            "fingerprints": fingerprints,
+            "loadouts": loadouts,
+            "names": names,
+            "ranks": ranks,
+            "player_stats": player_stats,
+            "rank_failures": rank_failures,
+            "stats_failures": stats_failures
+        }
+        return publish("complete")
+
+    @staticmethod
+    def _display_name(names: Dict[str, Dict], puuid: str) -> str:
+        """Uyarılarda kullanılan oyuncu adı (isim#tag)"""
+        name_data = names.get(puuid) or {}
+        return f"{name_data.get('GameName', 'Unknown')}#{name_data.get('TagLine', '')}"
+
+    def _format_ranks(self, ranks: Dict[str, Tuple], current_season: Optional[str], names: Dict[str, Dict]) -> Dict[str, str]:
+        """
+        Rank sonuçlarını gösterilecek string'lere çevirir (hatalar bir kez raporlanır)
+        Args:
+            ranks: {puuid: (rank_data, hata)}
+            current_season: Aktif sezon ID
+            names: {puuid: isim verisi}
+        Returns:
+            dict: {puuid: rank string}
+        """
+        if not current_season:
+            print(f"⚠️ Sezon bilgisi bulunamadı")
+            return {puuid: "?" for puuid in ranks}
 
+        result = {}
+        for player_puuid, (rank_data, rank_error) in ranks.items():
+            rank = "?"
+            if rank_error:
+                if "429" in str(rank_error) or "too many" in str(rank_error).lower():
+                    rank = "Rate Limit"
+                    print(f"⚠️ Rate limit: {self._display_name(names, player_puuid)}")
+                else:
+                    print(f"⚠️ Rank hatası ({self._display_name(names, player_puuid)}): {rank_error}")
+            elif rank_data:
+                rank = parse_rank(rank_data, current_season)
+            else:
+                print(f"⚠️ Rank verisi yok: {self._display_name(names, player_puuid)}")
+            result[player_puuid] = rank
+        return result
+
+    def _format_kd_hs(self, player_stats: Dict[str, Tuple], names: Dict[str, Dict]) -> Dict[str, Tuple]:
+        """
+        KD/HS sonuçlarını gösterilecek değerlere çevirir (hatalar bir kez raporlanır)
+        Args:
+            player_stats: {puuid: (stats, hata)}
+            names: {puuid: isim verisi}
+        Returns:
+            dict: {puuid: (kd, hs_percentage)}
+        """
+        result = {}
+        for player_puuid, (stats, stats_error) in player_stats.items():
+            kd = "?"
+            hs_percentage = "?"
+            if stats_error:
+                print(f"⚠️ KD/HS hatası ({self._display_name(names, player_puuid)}): {stats_error}")
+            elif stats:
+                kd = stats.get("kd", "?")
+                hs_percentage = stats.get("hs_percentage", "?")
+            result[player_puuid] = (kd, hs_percentage)
+        return result
+
+    def _build_game_info(self, match_id: str, match_details: Dict, loadouts: Dict, names: Dict[str, Dict],
+                         ranks: Dict[str, str], player_stats: Dict[str, Tuple], stage: str) -> Dict:
+        """
+        Oyuncu bilgilerini zenginleştirir
+        Args:
+            match_id: Match ID
+            match_details: Core-game maç verisi
+            loadouts: get_match_loadouts sonucu
+            names: {puuid: isim verisi}
+            ranks: {puuid: rank string} (bekleniyorsa PENDING)
+            player_stats: {puuid: (kd, hs_percentage)} (bekleniyorsa PENDING)
+            stage: basic, ranks, stats veya complete
+        Returns:
+            dict: match_id, match_details, players, stage
+        """
+        enriched_players = []
+        for player in match_details.get("Players", []):
             player_puuid = player.get("Subject", "")
             team_id = player.get("TeamID", "").capitalize()
 
-            player_name_data = next(
-                (p for p in player_names if p.get("Subject", "") == player_puuid),
-                None
-            )
+            player_name_data = names.get(player_puuid)
             game_name = player_name_data.get("GameName", "Unknown") if player_name_data else "Unknown"
             tag_line = player_name_data.get("TagLine", "") if player_name_data else ""
 
@@ -196,34 +537,8 @@ class GameService:
             skin_uuid = loadouts.get("PlayerSkins", {}).get(player_puuid, "")
             skin_name = self._skins.get(skin_uuid.lower() if skin_uuid else "", "Standart Vandal")
 
-            rank = "?"
-            if current_season:
-                try:
-                    rank_data = self.riot_api.get_player_rank(player_puuid)
-                    if rank_data:
-                        rank = parse_rank(rank_data, current_season)
-                    else:
-                        print(f"⚠️ Rank verisi yok: {game_name}#{tag_line}")
-                except Exception as e:
-                    if "429" in str(e) or "too many" in str(e).lower():
-                        rank = "Rate Limit"
-                        print(f"⚠️ Rate limit: {game_name}#{tag_line}")
-                    else:
-                        print(f"⚠️ Rank hatası ({game_name}#{tag_line}): {e}")
-                        rank = "?"
-            else:
-                print(f"⚠️ Sezon bilgisi bulunamadı")
-
-            # KD ve HS bilgilerini al (arka planda, hata varsa geç)
-            kd = "?"
-            hs_percentage = "?"
-            try:
-                stats = self.player_stats_service.get_kd_hs_stats(player_puuid, match_count=5)
-                if stats:
-                    kd = stats.get("kd", "?")
-                    hs_percentage = stats.get("hs_percentage", "?")
-            except Exception as e:
-                print(f"⚠️ KD/HS hatası ({game_name}#{tag_line}): {e}")
+            rank = ranks.get(player_puuid, "?")
+            kd, hs_percentage = player_stats.get(player_puuid, ("?", "?"))
 
             enriched_players.append({
                 "puuid": player_puuid,
@@ -243,7 +558,8 @@ class GameService:
         return {
             "match_id": match_id,
             "match_details": match_details,
-            "players": enriched_players
+            "players": enriched_players,
+            "stage": stage
         }
 
     def get_agent_name(self, agent_uuid: str) -> str:
@@ -0,0 +1,111 @@
+"""
+Match Summary
+Tamamlanmış maç detayından tek geçişte oyuncu bazlı özet (index) çıkarır
+İstatistik fonksiyonları ham JSON'u tekrar taramak yerine bu özete bakar.
+Özet sadece istatistiklerin okuduğu alanları kompakt kayıtlarda tutar
+(tuple'lar ve intern edilmiş kısa string'ler), bellekte ham JSON yerine saklanır.
+Özetler oluşturulduktan sonra değiştirilemez; cache'ten thread'ler ve oyuncular arasında kopyalanmadan paylaşılır.
+"""
+import sys
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Dict, Optional
+
+# Tek round'un sonucu (alan isimleri API'deki isimlerle aynı)
+RoundOutcome = namedtuple("RoundOutcome", ["plantSite", "winningTeam", "roundResultCode"])
+
+# Bir oyuncunun tek maçtaki toplamları
+PlayerSummary = namedtuple(
+    "PlayerSummary",
+    ["team", "kills", "deaths", "headshots", "bodyshots", "legshots", "rounds_played", "rounds_survived"]
+)
+
+# Tamamlanmış maçın istatistikler için gereken kısmı (players salt okunur {puuid: PlayerSummary})
+MatchSummary = namedtuple("MatchSummary", ["match_id", "map_id", "queue_id", "start_time", "players", "rounds"])
+
+# Oluşturma sırasındaki sayaç listesi PlayerSummary'nin team dışındaki alanlarıyla aynı sırada
+_HEADSHOTS, _BODYSHOTS, _LEGSHOTS, _PLAYED, _SURVIVED = range(2, 7)
+
+
+def parse_map_id(map_path: str) -> str:
+    """
+    Harita path'inden harita ismini çıkarır
+    Args:
+        map_path: matchInfo.mapId (örn: /Game/Maps/Pitt/Pitt)
+    Returns:
+        str: Küçük harf harita ismi (örn: pitt)
+    """
+    if map_path and "/" in map_path:
+        return map_path.split("/")[-1].lower()
+    return map_path.lower() if map_path else ""
+
+
+def _intern(value) -> Optional[str]:
+    """Takım/site/sonuç gibi tekrar eden kısa string'leri tek kopyaya indirir"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def build_match_summary(match_details: Dict) -> MatchSummary:
+    """
+    Maç detayını tek geçişte özetler
+    Args:
+        match_details: match-details endpoint'inden gelen ham veri
+    Returns:
+        MatchSummary: players {puuid: PlayerSummary} ve rounds (RoundOutcome tuple'ı)
+    """
+    match_info = match_details.get("matchInfo", {})
+
+    # puuid -> takım ve sayaçlar (sonunda PlayerSummary'ye dönüştürülür)
+    teams = {}
+    counters = {}
+    for player in match_details.get("players", []):
+        puuid = player.get("subject")
+        # Aynı oyuncu birden fazla geçerse ilk kayıt esas alınır
+        if not puuid or puuid in counters:
+            continue
+
+        stats = player.get("stats") or {}
+        teams[puuid] = _intern(player.get("teamId"))
+        counters[puuid] = [stats.get("kills", 0), stats.get("deaths", 0), 0, 0, 0, 0, 0]
+
+    rounds = []
+    for round_data in match_details.get("roundResults", []):
+        rounds.append(RoundOutcome(
+            _intern(round_data.get("plantSite", "")),
+            _intern(round_data.get("winningTeam", "")),
+            _intern(round_data.get("roundResultCode", ""))
+        ))
+
+        victims = {kill.get("victim") for kill in round_data.get("kills", [])}
+
+        round_players = set()
+        for player_stat in round_data.get("playerStats", []):
+            puuid = player_stat.get("subject")
+            player_counters = counters.get(puuid)
+            if player_counters is None:
+                # Oyuncu listesinde olmayan oyuncu (takımı bilinmiyor)
+                teams[puuid] = None
+                player_counters = counters[puuid] = [0, 0, 0, 0, 0, 0, 0]
+
+            for damage in player_stat.get("damage", []):
+                player_counters[_HEADSHOTS] += damage.get("headshots", 0)
+                player_counters[_BODYSHOTS] += damage.get("bodyshots", 0)
+                player_counters[_LEGSHOTS] += damage.get("legshots", 0)
+
+            round_players.add(puuid)
+
+        for puuid in round_players:
+            counters[puuid][_PLAYED] += 1
+            if puuid not in victims:
+                counters[puuid][_SURVIVED] += 1
+
+    players = {puuid: PlayerSummary(teams[puuid], *player_counters) for puuid, player_counters in counters.items()}
+
+    return MatchSummary(
+        match_info.get("matchId", ""),
+        _intern(parse_map_id(match_info.get("mapId", ""))),
+        _intern(match_info.get("queueID", "")),
+        match_info.get("gameStartMillis", 0),
+        MappingProxyType(players),
+        tuple(rounds)
+    )
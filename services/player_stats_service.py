@@ -2,10 +2,19 @@
 Player Statistics Service
 Son 5 maçtan istatistikleri hesaplar
 """
-import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 from api.riot_api import RiotAPI
+from config.settings import ENRICH_MAX_WORKERS
+from services.match_summary import MatchSummary, PlayerSummary, RoundOutcome, build_match_summary
+from services.stats_engine import RollingWindow
 from utils.cache import cache
+from utils.cancellation import with_context
+from utils.disk_cache import disk_cache
+
+
+class StatsUnavailable(Exception):
+    """Maç geçmişi veya maç detayı alınamadı (istek hatası; oyuncunun rekabetçi maçı olmamasından farklı)"""
 
 
 class PlayerStatsService:
@@ -13,6 +22,8 @@ class PlayerStatsService:
 
     def __init__(self, riot_api: RiotAPI):
         self.riot_api = riot_api
+        # Web isteklerinin ortak worker havuzu (istekler yine RiotAPI'nin rate limiter'ından geçer)
+        self._executor = ThreadPoolExecutor(max_workers=ENRICH_MAX_WORKERS, thread_name_prefix="player-stats")
 
     def get_player_stats(self, puuid: str, current_map_id: str = "") -> Optional[Dict]:
         """
@@ -32,63 +43,45 @@ class PlayerStatsService:
         if not matches:
             return None
 
-        # Harita bazlı roundları topla
+        # Harita bazlı roundları topla: (oyuncunun takımı, maçın round sonuçları)
         map_specific_rounds = []
+        map_player_summaries = []
         map_match_count = 0
 
-        for idx, match in enumerate(matches):
-            match_id = match.get("MatchID")
-            if not match_id:
-                continue
+        match_ids = [match.get("MatchID") for match in matches if match.get("MatchID")]
+        # Haritası index'ten bilinen maçlar detay indirilmeden elenir
+        indexed_matches = disk_cache.get_match_index(match_ids) if current_map_id else {}
 
-            # Rate limit önlemi: Her maç detayı arasında delay
-            if idx > 0:
-                time.sleep(0.5)
+        for match_id in match_ids:
+            if map_match_count >= 5:
+                break  # İlk 5 maç yeterli
 
-            match_details = self.riot_api.get_completed_match_details(match_id)
-            if not match_details:
+            indexed = indexed_matches.get(match_id)
+            if indexed and indexed[0] != current_map_id:
                 continue
 
-            # Harita bilgisini al - API'den matchInfo.mapId field'ı
-            match_map_path = match_details.get("matchInfo", {}).get("mapId", "")
-
-            # MapID path formatında geliyor: /Game/Maps/Pitt/Pitt
-            # Path'ten harita ismini çıkar: pitt
-            if match_map_path and "/" in match_map_path:
-                match_map_id = match_map_path.split("/")[-1].lower()
-            else:
-                match_map_id = match_map_path.lower() if match_map_path else ""
+            summary = self.get_match_summary(match_id)
+            if not summary:
+                continue
 
             # Sadece aynı haritadaki maçları al
-            if current_map_id and match_map_id != current_map_id:
+            if current_map_id and summary.map_id != current_map_id:
                 continue
 
             # Harita eşleşti, maç sayısını artır
             map_match_count += 1
-            if map_match_count > 5:
-                break  # İlk 5 maç yeterli
-
-            round_results = match_details.get("roundResults", [])
 
             # Oyuncunun hangi takımda olduğunu bul
-            players = match_details.get("players", [])
-            player_team = None
-
-            for player in players:
-                if player.get("subject") == puuid:
-                    player_team = player.get("teamId")
-                    break
-
-            if not player_team:
+            player_summary = summary.players.get(puuid)
+            if not player_summary or not player_summary.team:
                 continue
 
-            # Round results'lara oyuncu bilgisini ekle
-            for round_data in round_results:
-                round_data["playerTeam"] = player_team
-                map_specific_rounds.append(round_data)
+            # Cache'teki round tuple'ı kopyalanmadan, takım ayrı bağlam olarak verilir
+            map_specific_rounds.append((player_summary.team, summary.rounds))
+            map_player_summaries.append(player_summary)
 
         # Eğer harita bazlı round yoksa boş stats dön
-        if not map_specific_rounds:
+        if not any(rounds for _, rounds in map_specific_rounds):
             return {
                 "site_push_winrate": {
                     "A": {"winrate": 0.0, "wins": 0, "total": 0},
@@ -103,16 +96,16 @@ class PlayerStatsService:
         stats = {
             "site_push_winrate": self._calculate_site_push_winrate(map_specific_rounds),
             "retake_winrate": self._calculate_retake_winrate(map_specific_rounds),
-            "save_rate": self._calculate_save_rate(map_specific_rounds, puuid)
+            "save_rate": self._calculate_save_rate(map_player_summaries)
         }
 
         return stats
 
-    def _calculate_site_push_winrate(self, rounds: List[Dict]) -> Dict:
+    def _calculate_site_push_winrate(self, team_rounds: List[Tuple[str, Sequence[RoundOutcome]]]) -> Dict:
         """
         A/B site push winrate hesaplar
         Args:
-            rounds: Round results listesi
+            team_rounds: (oyuncunun takımı, o maçın round sonuçları) listesi
         Returns:
             dict: Site bazlı kazanma oranları
         """
@@ -122,19 +115,17 @@ class PlayerStatsService:
             "C": {"wins": 0, "total": 0}
         }
 
-        for round_data in rounds:
-            plant_site = round_data.get("plantSite", "")
-            if not plant_site or plant_site not in ["A", "B", "C"]:
-                continue
-
-            winning_team = round_data.get("winningTeam", "")
-            player_team = round_data.get("playerTeam", "")
+        for player_team, rounds in team_rounds:
+            for round_data in rounds:
+                plant_site = round_data.plantSite
+                if not plant_site or plant_site not in ["A", "B", "C"]:
+                    continue
 
-            site_stats[plant_site]["total"] += 1
+                site_stats[plant_site]["total"] += 1
 
-            # Eğer oyuncunun takımı kazandıysa
-            if winning_team == player_team:
-                site_stats[plant_site]["wins"] += 1
+                # Eğer oyuncunun takımı kazandıysa
+                if round_data.winningTeam == player_team:
+                    site_stats[plant_site]["wins"] += 1
 
         # Winrate hesapla
         winrates = {}
@@ -155,31 +146,26 @@ class PlayerStatsService:
 
         return winrates
 
-    def _calculate_retake_winrate(self, rounds: List[Dict]) -> Dict:
+    def _calculate_retake_winrate(self, team_rounds: List[Tuple[str, Sequence[RoundOutcome]]]) -> Dict:
         """
         Retake winrate hesaplar (plantSite + winningTeam + roundResultCode)
         Args:
-            rounds: Round results listesi
+            team_rounds: (oyuncunun takımı, o maçın round sonuçları) listesi
         Returns:
             dict: Retake kazanma oranı
         """
         retake_wins = 0
         retake_total = 0
 
-        for round_data in rounds:
-            plant_site = round_data.get("plantSite", "")
-            round_result_code = round_data.get("roundResultCode", "")
+        for player_team, rounds in team_rounds:
+            for round_data in rounds:
+                # Bomb plant edilmiş VE defuse ile bitmiş roundlar (retake durumu)
+                if round_data.plantSite and round_data.roundResultCode == "Defused":
+                    retake_total += 1
 
-            # Bomb plant edilmiş VE defuse ile bitmiş roundlar (retake durumu)
-            if plant_site and round_result_code == "Defused":
-                retake_total += 1
-
-                winning_team = round_data.get("winningTeam", "")
-                player_team = round_data.get("playerTeam", "")
-
-                # Oyuncunun takımı defuse yaparak kazandıysa
-                if winning_team == player_team:
-                    retake_wins += 1
+                    # Oyuncunun takımı defuse yaparak kazandıysa
+                    if round_data.winningTeam == player_team:
+                        retake_wins += 1
 
         if retake_total > 0:
             winrate = (retake_wins / retake_total) * 100
@@ -195,46 +181,16 @@ class PlayerStatsService:
                 "total": 0
             }
 
-    def _calculate_save_rate(self, rounds: List[Dict], puuid: str) -> Dict:
+    def _calculate_save_rate(self, player_summaries: List[PlayerSummary]) -> Dict:
         """
-        Save oranı hesaplar (kills[] ile round sonunda hayatta kalma kontrolü)
+        Save oranı hesaplar (round sonunda hayatta kalma, maç özetlerinden)
         Args:
-            rounds: Round results listesi
-            puuid: Player PUUID
+            player_summaries: Oyuncunun maç bazlı özetleri (rounds_played, rounds_survived)
         Returns:
             dict: Save oranı
         """
-        survived_rounds = 0
-        total_rounds = 0
-
-        for round_data in rounds:
-            # playerStats'da bu oyuncu var mı kontrol et
-            player_stats = round_data.get("playerStats", [])
-            player_in_round = False
-
-            for player_stat in player_stats:
-                if player_stat.get("subject") == puuid:
-                    player_in_round = True
-                    break
-
-            # Oyuncu bu roundda yoksa atla
-            if not player_in_round:
-                continue
-
-            total_rounds += 1
-
-            # Kills listesinde bu oyuncu victim olarak var mı?
-            kills = round_data.get("kills", [])
-            player_died = False
-
-            for kill in kills:
-                if kill.get("victim") == puuid:
-                    player_died = True
-                    break
-
-            # Eğer ölen listesinde yoksa hayatta kalmış demektir
-            if not player_died:
-                survived_rounds += 1
+        survived_rounds = sum(summary.rounds_survived for summary in player_summaries)
+        total_rounds = sum(summary.rounds_played for summary in player_summaries)
 
         if total_rounds > 0:
             save_rate = (survived_rounds / total_rounds) * 100
@@ -250,6 +206,34 @@ class PlayerStatsService:
                 "total": 0
             }
 
+    def get_match_summary(self, match_id: str) -> Optional[MatchSummary]:
+        """
+        Maçın oyuncu bazlı özetini döndürür (maç detayı geldiğinde bir kez hesaplanır, cache kullanır)
+        Bellekte ham maç detayı yerine bu kompakt özet tutulur.
+        Args:
+            match_id: Match ID
+        Returns:
+            MatchSummary: build_match_summary çıktısı veya None
+        """
+        return cache.get_or_compute('match_summaries', match_id, lambda: self._build_match_summary(match_id))
+
+    def _build_match_summary(self, match_id: str) -> Optional[MatchSummary]:
+        """
+        Tamamlanmış maç detayını alır ve özetler
+        Args:
+            match_id: Match ID
+        Returns:
+            MatchSummary: Maç özeti veya None
+        """
+        match_details = self.riot_api.get_completed_match_details(match_id)
+        if not match_details:
+            return None
+
+        summary = build_match_summary(match_details)
+        # Sonraki harita bazlı sorgular bu maçı indirmeden eleyebilsin
+        disk_cache.set_match_index(match_id, summary.map_id, summary.queue_id, summary.start_time)
+        return summary
+
     def get_kd_hs_stats(self, puuid: str, match_count: int = 5) -> Optional[Dict]:
         """
         Son N maçtan KD ve HS% hesaplar (cache kullanır)
@@ -259,79 +243,148 @@ class PlayerStatsService:
         Returns:
             dict: KD ve HS istatistikleri veya None
         """
-        # Cache'de var mı kontrol et
-        cached_stats = cache.get('player_stats', puuid)
-        if cached_stats:
-            return cached_stats
+        # Tracker ve web aynı oyuncuyu aynı anda isterse hesaplama bir kez yapılır
+        return cache.get_or_compute('player_stats', puuid, lambda: self._compute_kd_hs_stats(puuid, match_count))
 
-        # Son maçları al
+    def _get_window(self, puuid: str) -> RollingWindow:
+        """
+        Oyuncunun KD/HS penceresini döndürür (yoksa boş pencere oluşturur)
+        Args:
+            puuid: Player PUUID
+        Returns:
+            RollingWindow: Oyuncunun penceresi
+        """
+        return cache.get_or_compute('player_windows', puuid, lambda: RollingWindow(puuid))
+
+    def _get_recent_match_ids(self, puuid: str, match_count: int) -> Optional[List[str]]:
+        """
+        Oyuncunun son N rekabetçi maçının ID'lerini alır
+        Args:
+            puuid: Player PUUID
+            match_count: Kaç maç
+        Returns:
+            list: Match ID listesi (rekabetçi maçı yoksa boş) veya None (geçmiş alınamazsa)
+        """
         match_history = self.riot_api.get_match_history(puuid, start_index=0, end_index=match_count, queue="competitive")
         if not match_history:
             return None
 
         matches = match_history.get("History", [])
-        if not matches:
+        return [match["MatchID"] for match in matches[:match_count] if match.get("MatchID")]
+
+    def _compute_kd_hs_stats(self, puuid: str, match_count: int) -> Optional[Dict]:
+        """
+        Son N maçtan KD ve HS% hesaplar
+        Oyuncunun penceresinde olan maçlar tekrar işlenmez, sadece yeni maçların özeti alınır.
+        Args:
+            puuid: Player PUUID
+            match_count: Kaç maç incelenecek
+        Returns:
+            dict: KD ve HS istatistikleri veya None
+        """
+        match_ids = self._get_recent_match_ids(puuid, match_count)
+        if not match_ids:
             return None
 
-        total_kills = 0
-        total_deaths = 0
-        total_headshots = 0
-        total_bodyshots = 0
-        total_legshots = 0
+        window = self._get_window(puuid)
+        summaries = {match_id: self.get_match_summary(match_id) for match_id in window.missing(match_ids)}
+        return window.update(match_ids, summaries)
 
-        for idx, match in enumerate(matches[:match_count]):
-            match_id = match.get("MatchID")
-            if not match_id:
+    def iter_kd_hs_stats(self, puuids: List[str], match_count: int = 5) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """
+        Birden fazla oyuncu için KD ve HS% hesaplar, her oyuncunun sonucunu hazır olduğu anda verir
+        Hesaplamalar ortak havuzda çalışır; oyuncuların ortak maçları cache üzerinden bir kez indirilir.
+        Generator erken kapatılırsa (istemci bağlantısı koptu) başlamamış hesaplamalar iptal edilir.
+        Args:
+            puuids: Player PUUID listesi
+            match_count: Oyuncu başına kaç maç incelenecek
+        Returns:
+            Iterator: (puuid, KD/HS istatistikleri veya None) - bitiş sırasıyla
+        """
+        futures = {}
+        try:
+            for puuid in puuids:
+                cached_stats = cache.get('player_stats', puuid)
+                if cached_stats:
+                    yield puuid, cached_stats
+                else:
+                    futures[self._executor.submit(self.get_kd_hs_stats, puuid, match_count)] = puuid
+
+            for future in as_completed(futures):
+                try:
+                    stats = future.result()
+                except Exception:
+                    stats = None
+                yield futures[future], stats
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def get_lobby_kd_hs_stats(self, puuids: List[str], match_count: int = 5) -> Dict[str, object]:
+        """
+        Lobideki tüm oyuncular için KD ve HS% hesaplar
+        Önce tüm maç geçmişleri alınır, oyuncuların pencerelerinde olmayan maç ID'lerinin birleşimi bir kez indirilir;
+        birlikte oynayan oyuncuların ortak maçları ve daha önce işlenmiş maçlar tekrar istenmez.
+        Args:
+            puuids: Player PUUID listesi
+            match_count: Oyuncu başına kaç maç incelenecek
+        Returns:
+            dict: {puuid: KD/HS istatistikleri, None (rekabetçi maçı yok) veya StatsUnavailable (istek hatası)}
+        """
+        results = {}
+        pending = []
+        for puuid in puuids:
+            cached_stats = cache.get('player_stats', puuid)
+            if cached_stats:
+                results[puuid] = cached_stats
+            else:
+                pending.append(puuid)
+
+        if not pending:
+            return results
+
+        windows = {puuid: self._get_window(puuid) for puuid in pending}
+
+        with ThreadPoolExecutor(max_workers=ENRICH_MAX_WORKERS) as executor:
+            # 1) Tüm oyuncuların maç geçmişleri
+            history_ids = dict(zip(
+                pending,
+                executor.map(with_context(lambda p: self._get_recent_match_ids(p, match_count)), pending)
+            ))
+
+            # 2) Pencerelerde olmayan maç ID'lerinin birleşimi, her maç bir kez
+            unique_match_ids = list(dict.fromkeys(
+                match_id
+                for puuid, match_ids in history_ids.items() if match_ids
+                for match_id in windows[puuid].missing(match_ids)
+            ))
+            summaries = dict(zip(
+                unique_match_ids,
+                executor.map(with_context(self.get_match_summary), unique_match_ids)
+            ))
+
+        # 3) Her oyuncunun penceresi yeni maçlarla güncellenir, çıkan maçlar toplamdan düşülür
+        for puuid, match_ids in history_ids.items():
+            if match_ids is None:
+                results[puuid] = StatsUnavailable("maç geçmişi alınamadı")
+                continue
+            if not match_ids:
+                results[puuid] = None
                 continue
 
-            # Rate limit önlemi - daha uzun delay
-            if idx > 0:
-                time.sleep(2)
-
-            match_details = self.riot_api.get_completed_match_details(match_id)
-            if not match_details:
+            stats = windows[puuid].update(match_ids, summaries)
+            # Özeti alınamayan maç pencereye girmedi; eksik sonuç cache'e yazılmaz, sonraki çağrı sadece onu ister
+            failed = windows[puuid].missing(match_ids)
+            if failed:
+                results[puuid] = StatsUnavailable(f"{len(failed)} maç detayı alınamadı")
                 continue
 
-            # Oyuncunun stats bilgilerini bul
-            players = match_details.get("players", [])
-            for player in players:
-                if player.get("subject") == puuid:
-                    stats = player.get("stats", {})
-                    total_kills += stats.get("kills", 0)
-                    total_deaths += stats.get("deaths", 0)
-                    break
-
-            # Round bazlı headshot verilerini topla
-            round_results = match_details.get("roundResults", [])
-            for round_data in round_results:
-                player_stats = round_data.get("playerStats", [])
-
-                for player_stat in player_stats:
-                    if player_stat.get("subject") == puuid:
-                        damage_list = player_stat.get("damage", [])
-
-                        for damage in damage_list:
-                            total_headshots += damage.get("headshots", 0)
-                            total_bodyshots += damage.get("bodyshots", 0)
-                            total_legshots += damage.get("legshots", 0)
-
-        # KD hesapla
-        kd_ratio = round(total_kills / total_deaths, 2) if total_deaths > 0 else total_kills
-
-        # HS% hesapla
-        total_shots = total_headshots + total_bodyshots + total_legshots
-        hs_percentage = round((total_headshots / total_shots) * 100, 1) if total_shots > 0 else 0.0
-
-        result = {
-            "kd": kd_ratio,
-            "hs_percentage": hs_percentage,
-            "total_kills": total_kills,
-            "total_deaths": total_deaths,
-            "total_headshots": total_headshots,
-            "total_shots": total_shots
-        }
+            cache.set('player_stats', puuid, stats)
+            results[puuid] = stats
 
-        # Cache'e kaydet (15 dakika saklanır)
-        cache.set('player_stats', puuid, result)
+        requested = sum(len(match_ids) for match_ids in history_ids.values() if match_ids)
+        if requested > len(unique_match_ids):
+            print(f"📊 Lobi istatistikleri: {len(unique_match_ids)} maç özeti ({requested} yerine, "
+                  f"{requested - len(unique_match_ids)} ortak/işlenmiş maç tekrar istenmedi)")
 
-        return result
+        return results
@@ -0,0 +1,93 @@
+"""
+Stats Engine
+Maç özetlerinden KD ve HS% hesaplar
+RollingWindow oyuncunun son N maçının KD/HS toplamlarını tutar; yenilemede sadece yeni maç eklenir, en eski çıkarılır.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+from services.match_summary import MatchSummary, PlayerSummary
+
+
+def kd_hs_result(kills: int, deaths: int, headshots: int, bodyshots: int, legshots: int) -> Dict:
+    """
+    Toplamlardan KD ve HS% sözlüğü
+    Args:
+        kills, deaths, headshots, bodyshots, legshots: Maçların toplamları
+    Returns:
+        dict: KD ve HS istatistikleri
+    """
+    total_shots = headshots + bodyshots + legshots
+    return {
+        "kd": round(kills / deaths, 2) if deaths > 0 else kills,
+        "hs_percentage": round((headshots / total_shots) * 100, 1) if total_shots > 0 else 0.0,
+        "total_kills": kills,
+        "total_deaths": deaths,
+        "total_headshots": headshots,
+        "total_shots": total_shots
+    }
+
+
+class RollingWindow:
+    """Oyuncunun son N maçındaki KD/HS toplamları (yeni maç eklenir, pencereden çıkan maç toplamdan düşülür)"""
+
+    def __init__(self, puuid: str):
+        """
+        Args:
+            puuid: Player PUUID
+        """
+        self.puuid = puuid
+        # match_id -> oyuncunun o maçtaki özeti (maçta yoksa None, katkısı 0)
+        self.entries: Dict[str, Optional[PlayerSummary]] = {}
+        # kills, deaths, headshots, bodyshots, legshots
+        self.totals = [0, 0, 0, 0, 0]
+        self.lock = threading.Lock()
+
+    def missing(self, match_ids: Iterable[str]) -> List[str]:
+        """
+        Pencerede olmayan (özeti alınması gereken) maçlar
+        Args:
+            match_ids: Güncel maç ID'leri
+        Returns:
+            list: Pencereye eklenecek maç ID'leri
+        """
+        with self.lock:
+            return [match_id for match_id in match_ids if match_id not in self.entries]
+
+    def _apply(self, player: Optional[PlayerSummary], sign: int):
+        """Oyuncunun maç toplamlarını ekler (1) veya çıkarır (-1)"""
+        if player is None:
+            return
+        self.totals[0] += sign * player.kills
+        self.totals[1] += sign * player.deaths
+        self.totals[2] += sign * player.headshots
+        self.totals[3] += sign * player.bodyshots
+        self.totals[4] += sign * player.legshots
+
+    def update(self, match_ids: List[str], summaries: Dict[str, Optional[MatchSummary]]) -> Dict:
+        """
+        Pencereyi güncel maç listesine getirir ve KD/HS döndürür
+        Listede olmayan maçlar çıkarılır, yeni maçlar summaries'ten eklenir.
+        Özeti alınamayan maç pencereye girmez (katkısı 0), sonraki yenilemede tekrar denenir.
+        Args:
+            match_ids: Güncel maç ID'leri (en yeniden eskiye)
+            summaries: Yeni maçların özetleri {match_id: MatchSummary veya None}
+        Returns:
+            dict: KD ve HS istatistikleri
+        """
+        with self.lock:
+            current = set(match_ids)
+            for match_id in [match_id for match_id in self.entries if match_id not in current]:
+                self._apply(self.entries.pop(match_id), -1)
+
+            for match_id in match_ids:
+                if match_id in self.entries:
+                    continue
+                summary = summaries.get(match_id)
+                if summary is None:
+                    continue
+
+                player = summary.players.get(self.puuid)
+                self.entries[match_id] = player
+                self._apply(player, 1)
+
+            return kd_hs_result(*self.totals)
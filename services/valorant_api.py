@@ -2,9 +2,9 @@
 Valorant-API.com Servisi
 Ajan ve silah bilgilerini dinamik olarak çeker
 """
-import requests
 from typing import Dict, Optional
 from config.settings import VALORANT_API_BASE, VALORANT_API_LANGUAGE, VANDAL_UUID
+from utils.http import create_session
 
 
 class ValorantAPIService:
@@ -13,6 +13,7 @@ class ValorantAPIService:
     def __init__(self):
         self.base_url = VALORANT_API_BASE
         self.language = VALORANT_API_LANGUAGE
+        self.session = create_session()
 
     def get_agents(self) -> Dict[str, str]:
         """
@@ -27,7 +28,7 @@ class ValorantAPIService:
                 "isPlayableCharacter": "true"
             }
 
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             agents_data = response.json()["data"]
 
@@ -102,7 +103,7 @@ class ValorantAPIService:
             url = f"{self.base_url}/weapons/{VANDAL_UUID}"
             params = {"language": self.language}
 
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             skins_data = response.json()["data"]["skins"]
 
@@ -138,7 +139,7 @@ class ValorantAPIService:
         """
         try:
             url = f"{self.base_url}/version"
-            response = requests.get(url)
+            response = self.session.get(url)
             response.raise_for_status()
             version_data = response.json()
             return version_data["data"]["riotClientVersion"]
@@ -167,7 +168,7 @@ class ValorantAPIService:
             url = f"{self.base_url}/weapons/skins"
             params = {"language": self.language}
 
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             skins_data = response.json()["data"]
 
@@ -210,7 +211,7 @@ class ValorantAPIService:
             url = f"{self.base_url}/weapons/skins/{skin_uuid}"
             params = {"language": self.language}
 
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             skin_data = response.json()["data"]
 
@@ -242,7 +243,7 @@ class ValorantAPIService:
             url = f"{self.base_url}/weapons/{weapon_uuid}"
             params = {"language": self.language}
 
-            response = requests.get(url, params=params)
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             weapon_data = response.json()["data"]
 
@@ -4,12 +4,20 @@ Yardımcı fonksiyonlar ve sınıflar
 """
 from .colors import Colors
 from .cache import cache, Cache
+from .disk_cache import disk_cache, DiskCache
+from .rate_limiter import TokenBucket, RateLimiter
+from .http import create_session
 from .display import print_ascii_art, print_status, create_player_table
 
 __all__ = [
     'Colors',
     'cache',
     'Cache',
+    'disk_cache',
+    'DiskCache',
+    'TokenBucket',
+    'RateLimiter',
+    'create_session',
     'print_ascii_art',
     'print_status',
     'create_player_table'
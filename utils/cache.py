@@ -1,46 +1,240 @@
+import sys
 import time
+import threading
+from collections import OrderedDict
+from utils.cancellation import OperationCancelled
 
 # Cache süresi (15 dakika - bir oyun süresi)
 # Rank bilgileri çok sık değişmez, rate limiting'i önlemek için uzun tutuyoruz
 CACHE_DURATION = 900  # saniye (15 dakika)
 
-class Cache:
+# Tip bazlı politika: (ttl saniye, maksimum kayıt, maksimum byte - None ise sınırsız)
+# Tamamlanmış maçlar değişmez, uzun tutulur (maç geçmişi utils.history_store'da tutulur)
+CACHE_POLICIES = {
+    'ranks': (CACHE_DURATION, 1000, None),             # puuid -> rank_data
+    'hs_stats': (CACHE_DURATION, 1000, None),          # puuid -> hs_data
+    'party_info': (CACHE_DURATION, 1000, None),        # puuid -> party_data
+    'match_details': (CACHE_DURATION, 20, None),       # match_id -> match_data
+    'match_loadouts': (CACHE_DURATION, 20, None),      # match_id -> loadouts_data
+    'player_names': (3600, 2000, None),                # puuid -> names_data
+    'season_info': (3600, 10, None),                   # shard -> season_data
+    'player_level': (CACHE_DURATION, 1000, None),      # puuid -> level_data
+    'player_stats': (CACHE_DURATION, 1000, None),      # puuid -> kd_hs_stats
+    # Ham maç detayı sadece özet çıkarılana kadar kısa süre tutulur (kalıcı kopya diskte)
+    'completed_match_details': (120, 20, 16 * 1024 * 1024),  # match_id -> completed_match_data
+    'match_summaries': (6 * 3600, 5000, None),         # match_id -> MatchSummary (kompakt özet)
+    'player_windows': (6 * 3600, 2000, None)           # puuid -> RollingWindow (son N maç toplamları)
+}
+
+# Süresi dolan kayıtlar bu aralıkla set() içinde toplu temizlenir (amortize sweeper)
+SWEEP_INTERVAL = 60  # saniye
+
+
+def estimate_size(value) -> int:
+    """
+    JSON benzeri bir değerin bellekteki yaklaşık boyutunu hesaplar (byte)
+    Args:
+        value: dict/list/tuple/str/int/float/None
+    Returns:
+        int: Yaklaşık byte
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return size
+
+
+class _Entry:
+    """Cache kaydı"""
+    __slots__ = ('value', 'expires_at', 'size')
+
+    def __init__(self, value, expires_at, size):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class _InFlight:
+    """Devam eden bir yükleme (bekleyenler sonucu buradan okur)"""
+
     def __init__(self):
-        self.data = {
-            'ranks': {},      # puuid -> (rank_data, timestamp)
-            'hs_stats': {},   # puuid -> (hs_data, timestamp)
-            'party_info': {}, # puuid -> (party_data, timestamp)
-            'match_details': {}, # match_id -> (match_data, timestamp)
-            'match_loadouts': {}, # match_id -> (loadouts_data, timestamp)
-            'player_names': {}, # puuid_list_str -> (names_data, timestamp)
-            'season_info': {}, # shard -> (season_data, timestamp)
-            'player_level': {}, # puuid -> (level_data, timestamp)
-            'player_stats': {}, # puuid -> (kd_hs_stats, timestamp)
-            'match_history': {}, # puuid_params -> (history_data, timestamp)
-            'completed_match_details': {} # match_id -> (completed_match_data, timestamp)
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class Cache:
+    def __init__(self, policies=None):
+        """
+        Args:
+            policies: {cache_type: (ttl, max_entries, max_bytes)} (varsayılan CACHE_POLICIES)
+        """
+        self.policies = dict(policies or CACHE_POLICIES)
+        # cache_type -> OrderedDict(key -> _Entry), sıralama LRU (en eski başta)
+        self.data = {cache_type: OrderedDict() for cache_type in self.policies}
+        self.bytes = {cache_type: 0 for cache_type in self.policies}
+        self.counters = {
+            cache_type: {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0}
+            for cache_type in self.policies
         }
-    
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+        # Devam eden yüklemeler: (cache_type, key) -> _InFlight
+        self._in_flight = {}
+        self._flight_lock = threading.Lock()
+
+    def _remove(self, cache_type, key):
+        """Kaydı siler ve byte sayacını günceller (lock altında çağrılmalı)"""
+        entry = self.data[cache_type].pop(key)
+        self.bytes[cache_type] -= entry.size
+
     def get(self, cache_type, key):
         """Cache'den veri al"""
-        if cache_type in self.data and key in self.data[cache_type]:
-            data, timestamp = self.data[cache_type][key]
-            if time.time() - timestamp < CACHE_DURATION:
-                return data
-        return None
-    
+        if cache_type not in self.data:
+            return None
+
+        with self._lock:
+            entries = self.data[cache_type]
+            entry = entries.get(key)
+            if entry is None:
+                self.counters[cache_type]['misses'] += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(cache_type, key)
+                self.counters[cache_type]['expired'] += 1
+                self.counters[cache_type]['misses'] += 1
+                return None
+
+            entries.move_to_end(key)
+            self.counters[cache_type]['hits'] += 1
+            return entry.value
+
     def set(self, cache_type, key, value):
-        """Cache'e veri kaydet"""
-        if cache_type in self.data:
-            self.data[cache_type][key] = (value, time.time())
-    
+        """Cache'e veri kaydet (kayıt/byte bütçesi aşılırsa en eski kullanılan silinir)"""
+        if cache_type not in self.data:
+            return
+
+        ttl, max_entries, max_bytes = self.policies[cache_type]
+        # Boyut sadece byte bütçesi olan tiplerde hesaplanır
+        size = estimate_size(value) if max_bytes else 0
+
+        with self._lock:
+            now = time.monotonic()
+            entries = self.data[cache_type]
+            if key in entries:
+                self._remove(cache_type, key)
+
+            entries[key] = _Entry(value, now + ttl, size)
+            self.bytes[cache_type] += size
+
+            while entries and (
+                (max_entries and len(entries) > max_entries)
+                or (max_bytes and self.bytes[cache_type] > max_bytes)
+            ):
+                oldest_key = next(iter(entries))
+                self._remove(cache_type, oldest_key)
+                self.counters[cache_type]['evictions'] += 1
+
+            if now - self._last_sweep >= SWEEP_INTERVAL:
+                self._sweep(now)
+
+    def _sweep(self, now):
+        """Süresi dolan tüm kayıtları siler (lock altında çağrılmalı)"""
+        self._last_sweep = now
+        for cache_type, entries in self.data.items():
+            expired_keys = [key for key, entry in entries.items() if entry.expires_at <= now]
+            for key in expired_keys:
+                self._remove(cache_type, key)
+            self.counters[cache_type]['expired'] += len(expired_keys)
+
+    def get_or_compute(self, cache_type, key, loader):
+        """
+        Cache'den veri al, yoksa loader ile yükle (single-flight)
+        Aynı key için eşzamanlı çağıranlar tek bir yüklemeyi bekler, upstream'e tek istek gider.
+        None dönen (başarısız) yüklemeler cache'e yazılmaz.
+        Yükleyenin işi iptal edildiyse (OperationCancelled) bekleyenler yüklemeyi kendileri tekrar dener.
+        Args:
+            cache_type: Cache tipi
+            key: Cache anahtarı
+            loader: Veriyi üreten fonksiyon (argümansız)
+        Returns:
+            Cache'deki veya yüklenen veri
+        """
+        value = self.get(cache_type, key)
+        if value is not None:
+            return value
+
+        while True:
+            with self._flight_lock:
+                flight = self._in_flight.get((cache_type, key))
+                is_leader = flight is None
+                if is_leader:
+                    # Kilit alınana kadar başka bir yükleme bitmiş olabilir
+                    value = self.get(cache_type, key)
+                    if value is not None:
+                        return value
+                    flight = _InFlight()
+                    self._in_flight[(cache_type, key)] = flight
+
+            if is_leader:
+                break
+
+            flight.done.wait()
+            if isinstance(flight.error, OperationCancelled):
+                continue
+            if flight.error:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            if flight.value is not None:
+                self.set(cache_type, key, flight.value)
+            return flight.value
+        except (Exception, OperationCancelled) as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flight_lock:
+                del self._in_flight[(cache_type, key)]
+            flight.done.set()
+
+    def stats(self):
+        """
+        Tip bazlı cache istatistikleri
+        Returns:
+            dict: {cache_type: {entries, bytes, hits, misses, evictions, expired}}
+        """
+        with self._lock:
+            return {
+                cache_type: {
+                    'entries': len(self.data[cache_type]),
+                    'bytes': self.bytes[cache_type],
+                    **self.counters[cache_type]
+                }
+                for cache_type in self.data
+            }
+
     def clear(self, cache_type=None):
         """Cache'i temizle"""
-        if cache_type:
-            if cache_type in self.data:
-                self.data[cache_type].clear()
-        else:
-            for cache_dict in self.data.values():
-                cache_dict.clear()
+        with self._lock:
+            if cache_type:
+                if cache_type in self.data:
+                    self.data[cache_type].clear()
+                    self.bytes[cache_type] = 0
+            else:
+                for name, cache_dict in self.data.items():
+                    cache_dict.clear()
+                    self.bytes[name] = 0
 
 # Global cache instance
-cache = Cache() 
\ No newline at end of file
+cache = Cache()
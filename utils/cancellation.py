@@ -0,0 +1,87 @@
+"""
+Cancellation
+Maç ID'sine bağlı iptal token'ı ve süre sınırı (deadline)
+Token context değişkeninde taşınır; RiotAPI her istekten önce kontrol eder,
+maç bittiğinde veya değiştiğinde eski işin kalan istekleri atılmaz.
+"""
+import time
+import threading
+import contextvars
+from typing import Callable, Optional
+
+
+class OperationCancelled(BaseException):
+    """
+    Token iptal edildi veya süresi doldu
+    BaseException'dan türer: istek metodlarındaki `except Exception` blokları yutmaz, iş en üste kadar durur.
+    """
+
+
+class CancellationToken:
+    """Bir maçın bilgi toplama işine ait iptal durumu"""
+
+    def __init__(self, match_id: str, timeout: Optional[float] = None):
+        """
+        Args:
+            match_id: İşin ait olduğu maç ID'si
+            timeout: Süre sınırı (saniye), None ise sınırsız
+        """
+        self.match_id = match_id
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._cancelled = threading.Event()
+        self.reason = ""
+
+    def cancel(self, reason: str = ""):
+        """Token'ı iptal eder (bekleyen ve sonraki istekler atılmaz)"""
+        if not self._cancelled.is_set():
+            self.reason = reason
+            self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """İptal edildi veya süresi doldu mu"""
+        if self._cancelled.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("süre doldu")
+            return True
+        return False
+
+    def check(self):
+        """İptal edildiyse OperationCancelled fırlatır"""
+        if self.cancelled:
+            raise OperationCancelled(f"{self.match_id}: {self.reason}")
+
+
+# O anki işin token'ı (asyncio task'ları ve to_thread ile otomatik taşınır)
+current_token: contextvars.ContextVar[Optional[CancellationToken]] = contextvars.ContextVar("current_token", default=None)
+
+
+def check_cancelled():
+    """Çalışan işin token'ı iptal edildiyse OperationCancelled fırlatır (token yoksa bir şey yapmaz)"""
+    token = current_token.get()
+    if token is not None:
+        token.check()
+
+
+def is_cancelled() -> bool:
+    """Çalışan işin token'ı iptal edildi mi"""
+    token = current_token.get()
+    return token is not None and token.cancelled
+
+
+def with_context(func: Callable) -> Callable:
+    """
+    Fonksiyonu çağıranın context'i (token dahil) ile çalışacak şekilde sarar
+    ThreadPoolExecutor/run_in_executor context'i kendiliğinden taşımaz; her çağrı context'in kopyasında çalışır.
+    Args:
+        func: Worker thread'inde çalışacak fonksiyon
+    Returns:
+        Callable: Sarılmış fonksiyon
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+
+    return run
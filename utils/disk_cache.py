@@ -0,0 +1,247 @@
+"""
+Disk Cache
+Değişmeyen tamamlanmış maç detaylarını SQLite'ta sıkıştırılmış olarak saklar
+(yeniden başlatmalarda ve tekrar karşılaşılan rakiplerde maç detayı isteği atılmaz)
+Görülen her maçın harita/mod/başlangıç zamanı ayrı bir index tablosunda tutulur;
+harita bazlı sorgular maç detayını indirmeden filtrelenir.
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from typing import Optional, Dict, Iterable, Tuple
+from config.settings import DISK_CACHE_ENABLED, DISK_CACHE_MAX_BYTES
+
+
+def get_default_path() -> str:
+    """
+    Cache dosyasının varsayılan yolu (%LOCALAPPDATA%/X-Tracker veya ~/.x-tracker)
+    Returns:
+        str: SQLite dosya yolu
+    """
+    localappdata = os.getenv('LOCALAPPDATA')
+    if localappdata:
+        directory = os.path.join(localappdata, 'X-Tracker')
+    else:
+        directory = os.path.join(os.path.expanduser('~'), '.x-tracker')
+    return os.path.join(directory, 'match_cache.sqlite3')
+
+
+class DiskCache:
+    """SQLite tabanlı, boyut sınırlı kalıcı cache (match_id -> zlib sıkıştırılmış JSON)"""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DISK_CACHE_MAX_BYTES, enabled: bool = DISK_CACHE_ENABLED):
+        """
+        Args:
+            path: SQLite dosya yolu (varsayılan get_default_path())
+            max_bytes: Sıkıştırılmış verinin toplam üst sınırı, aşılınca en eski erişilenler silinir
+            enabled: False ise hiçbir şey okunmaz/yazılmaz
+        """
+        self.path = path or get_default_path()
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        # match_id -> (map_id, queue_id, start_time), diskten okunanlar ve yeni yazılanlar
+        self._match_index: Dict[str, Tuple[str, str, int]] = {}
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Bağlantıyı ilk kullanımda açar, açılamazsa disk cache devre dışı kalır (lock altında çağrılmalı)"""
+        if self._conn is not None or not self.enabled:
+            return self._conn
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS completed_matches ('
+                'match_id TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            # Index satırları küçüktür, boyut sınırına dahil edilmez ve maç detayı silinse de kalır
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS match_index ('
+                'match_id TEXT PRIMARY KEY, map_id TEXT NOT NULL, queue_id TEXT NOT NULL, start_time INTEGER NOT NULL)'
+            )
+            conn.commit()
+            self._total_bytes = conn.execute('SELECT COALESCE(SUM(size), 0) FROM completed_matches').fetchone()[0]
+            self._conn = conn
+
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️ Disk cache açılamadı, devre dışı: {e}")
+            self.enabled = False
+
+        return self._conn
+
+    def get(self, match_id: str) -> Optional[Dict]:
+        """
+        Maç detayını diskten okur
+        Args:
+            match_id: Match ID
+        Returns:
+            dict: Match details veya None
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+
+            try:
+                row = conn.execute('SELECT data FROM completed_matches WHERE match_id = ?', (match_id,)).fetchone()
+                if row is None:
+                    return None
+
+                conn.execute('UPDATE completed_matches SET last_access = ? WHERE match_id = ?', (time.time(), match_id))
+                conn.commit()
+                data = row[0]
+
+            except sqlite3.Error:
+                return None
+
+        try:
+            return json.loads(zlib.decompress(data))
+        except (zlib.error, ValueError):
+            return None
+
+    def set(self, match_id: str, value: Dict):
+        """
+        Maç detayını sıkıştırıp diske yazar, boyut sınırı aşılırsa en eski erişilenleri siler
+        Args:
+            match_id: Match ID
+            value: Match details
+        """
+        if not self.enabled:
+            return
+
+        data = zlib.compress(json.dumps(value, separators=(',', ':')).encode())
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+
+            try:
+                row = conn.execute('SELECT size FROM completed_matches WHERE match_id = ?', (match_id,)).fetchone()
+                if row:
+                    self._total_bytes -= row[0]
+
+                conn.execute(
+                    'INSERT OR REPLACE INTO completed_matches (match_id, data, size, last_access) VALUES (?, ?, ?, ?)',
+                    (match_id, data, len(data), time.time())
+                )
+                self._total_bytes += len(data)
+
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn)
+
+                conn.commit()
+
+            except sqlite3.Error as e:
+                print(f"⚠️ Disk cache yazma hatası: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Toplam boyut sınırın %90'ına inene kadar en eski erişilen maçları siler (lock altında çağrılmalı)"""
+        target = self.max_bytes * 0.9
+        rows = conn.execute('SELECT match_id, size FROM completed_matches ORDER BY last_access').fetchall()
+
+        evicted = []
+        for match_id, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((match_id,))
+            self._total_bytes -= size
+
+        conn.executemany('DELETE FROM completed_matches WHERE match_id = ?', evicted)
+
+    def get_match_index(self, match_ids: Iterable[str]) -> Dict[str, Tuple[str, str, int]]:
+        """
+        Maçların harita/mod/başlangıç zamanı bilgisini index'ten okur
+        Args:
+            match_ids: Match ID'leri
+        Returns:
+            dict: {match_id: (map_id, queue_id, start_time)} (index'te olmayanlar dahil edilmez)
+        """
+        with self._lock:
+            result = {}
+            missing = []
+            for match_id in match_ids:
+                entry = self._match_index.get(match_id)
+                if entry is not None:
+                    result[match_id] = entry
+                else:
+                    missing.append(match_id)
+
+            conn = self._connect()
+            if conn is None or not missing:
+                return result
+
+            try:
+                placeholders = ','.join('?' * len(missing))
+                rows = conn.execute(
+                    f'SELECT match_id, map_id, queue_id, start_time FROM match_index WHERE match_id IN ({placeholders})',
+                    missing
+                ).fetchall()
+            except sqlite3.Error:
+                return result
+
+            for match_id, map_id, queue_id, start_time in rows:
+                result[match_id] = self._match_index[match_id] = (map_id, queue_id, start_time)
+            return result
+
+    def set_match_index(self, match_id: str, map_id: str, queue_id: str, start_time: int):
+        """
+        Maçın harita/mod/başlangıç zamanı bilgisini index'e yazar
+        Args:
+            match_id: Match ID
+            map_id: Harita ismi (örn: ascent)
+            queue_id: Mod (örn: competitive)
+            start_time: Başlangıç zamanı (ms)
+        """
+        entry = (map_id, queue_id, start_time)
+        with self._lock:
+            if self._match_index.get(match_id) == entry:
+                return
+            self._match_index[match_id] = entry
+
+            conn = self._connect()
+            if conn is None:
+                return
+
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO match_index (match_id, map_id, queue_id, start_time) VALUES (?, ?, ?, ?)',
+                    (match_id, *entry)
+                )
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Maç index yazma hatası: {e}")
+
+    def stats(self) -> Dict:
+        """
+        Disk cache istatistikleri
+        Returns:
+            dict: {entries, bytes, max_bytes, indexed_matches}
+        """
+        with self._lock:
+            conn = self._connect()
+            entries = 0
+            indexed_matches = len(self._match_index)
+            if conn is not None:
+                try:
+                    entries = conn.execute('SELECT COUNT(*) FROM completed_matches').fetchone()[0]
+                    indexed_matches = conn.execute('SELECT COUNT(*) FROM match_index').fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                'entries': entries,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'indexed_matches': indexed_matches
+            }
+
+
+# Global disk cache instance
+disk_cache = DiskCache()
@@ -5,6 +5,9 @@ from rich.table import Table
 from rich.text import Text
 from utils.colors import Colors
 
+# Henüz gelmeyen (yükleniyor) alanların değeri
+PENDING = "..."
+
 console = Console()
 
 
@@ -82,6 +85,19 @@ def print_status(message: str, clear_screen: bool = False, status_type: str = "i
     print(f"{' ' * padding}{message}")
 
 
+def format_percentage(value) -> str:
+    """
+    HS% değerini tabloda gösterilecek hale getirir
+    Args:
+        value: Yüzde, "?" (bilinmiyor) veya PENDING (yükleniyor)
+    Returns:
+        str: "24.5%" veya değerin kendisi
+    """
+    if value in ('?', PENDING):
+        return value
+    return f"{value}%"
+
+
 def create_player_table(game_info: dict) -> Table:
     players = game_info.get("players", [])
 
@@ -111,7 +127,7 @@ def create_player_table(game_info: dict) -> Table:
         rank = ansi_to_rich(player.get('rank', '?'))
         agent_name = ansi_to_rich(player['agent_name'])
         kd = str(player.get('kd', '?'))
-        hs = f"{player.get('hs_percentage', '?')}%" if player.get('hs_percentage') != '?' else '?'
+        hs = format_percentage(player.get('hs_percentage', '?'))
         skin_name = player['vandal_skin']
 
         table.add_row(player_name, level, rank, agent_name, kd, hs, skin_name)
@@ -124,7 +140,7 @@ def create_player_table(game_info: dict) -> Table:
         rank = ansi_to_rich(player.get('rank', '?'))
         agent_name = ansi_to_rich(player['agent_name'])
         kd = str(player.get('kd', '?'))
-        hs = f"{player.get('hs_percentage', '?')}%" if player.get('hs_percentage') != '?' else '?'
+        hs = format_percentage(player.get('hs_percentage', '?'))
         skin_name = player['vandal_skin']
 
         table.add_row(player_name, level, rank, agent_name, kd, hs, skin_name)
@@ -0,0 +1,159 @@
+"""
+Match History Store
+PUUID + kuyruk başına maç geçmişini tek bir pencere (en yeniden başlayan, kesintisiz liste) olarak tutar.
+Farklı aralık istekleri (0-5, 0-15) aynı pencereden cevaplanır; pencere gerektikçe sondan genişletilir.
+Süresi dolan pencere baştan tamamen indirilmez, sadece en yeni birkaç maç istenip mevcut başa eklenir.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+# Pencerenin yenilenmeden kullanılacağı süre (yeni maç oynanmış olabilir)
+HISTORY_TTL = 120  # saniye
+# Baş yenilemesinde istenen maç sayısı (bu kadar maç içinde eski baş bulunamazsa pencere baştan indirilir)
+HEAD_REFRESH_SIZE = 3
+# Tutulacak maksimum oyuncu/kuyruk penceresi (en eski kullanılan silinir)
+MAX_WINDOWS = 1000
+# Pencere başına tutulacak maksimum maç (baş yenilemeleriyle büyüyen pencerenin sonu kesilir)
+MAX_ENTRIES = 30
+
+
+class _Window:
+    """Bir oyuncu/kuyruk için index 0'dan başlayan maç geçmişi"""
+    __slots__ = ('entries', 'total', 'refreshed_at', 'lock')
+
+    def __init__(self):
+        self.entries: List[Dict] = []
+        self.total = 0
+        self.refreshed_at = 0.0
+        self.lock = threading.Lock()
+
+
+class MatchHistoryStore:
+    def __init__(self, fetch: Callable[[str, int, int, str], Optional[Dict]],
+                 ttl: float = HISTORY_TTL, max_windows: int = MAX_WINDOWS):
+        """
+        Args:
+            fetch: (puuid, start_index, end_index, queue) -> match-history cevabı veya None
+            ttl: Pencerenin yenilenmeden kullanılacağı süre (saniye)
+            max_windows: Tutulacak maksimum pencere sayısı
+        """
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_windows = max_windows
+        self._windows: "OrderedDict[tuple, _Window]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'initial': 0, 'head_refreshes': 0, 'extensions': 0, 'refetches': 0}
+
+    def _get_window(self, key: tuple) -> _Window:
+        """Pencereyi döndürür, yoksa oluşturur (LRU sırası güncellenir)"""
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = _Window()
+                while len(self._windows) > self.max_windows:
+                    self._windows.popitem(last=False)
+            else:
+                self._windows.move_to_end(key)
+            return window
+
+    def get(self, puuid: str, start_index: int, end_index: int, queue: str) -> Optional[Dict]:
+        """
+        Maç geçmişinin [start_index, end_index) aralığını döndürür
+        Args:
+            puuid: Player PUUID
+            start_index: Başlangıç indeksi
+            end_index: Bitiş indeksi
+            queue: Kuyruk tipi
+        Returns:
+            dict: match-history cevabıyla aynı yapı (Subject, BeginIndex, EndIndex, Total, History) veya None
+        """
+        window = self._get_window((puuid, queue))
+
+        # Aynı oyuncu için eşzamanlı çağıranlar tek bir isteği bekler
+        with window.lock:
+            now = time.monotonic()
+            if not window.refreshed_at:
+                if not self._refetch(window, puuid, end_index, queue):
+                    return None
+                self.counters['initial'] += 1
+            else:
+                is_stale = now - window.refreshed_at >= self.ttl
+                if is_stale:
+                    # Yenileme başarısız olursa eldeki (eski) pencere kullanılır
+                    self._refresh_head(window, puuid, queue)
+
+                if end_index > len(window.entries) and len(window.entries) < window.total:
+                    self._extend(window, puuid, end_index, queue)
+                elif not is_stale:
+                    self.counters['hits'] += 1
+
+            return {
+                "Subject": puuid,
+                "BeginIndex": start_index,
+                "EndIndex": end_index,
+                "Total": window.total,
+                "History": window.entries[start_index:end_index]
+            }
+
+    def _refetch(self, window: _Window, puuid: str, end_index: int, queue: str) -> bool:
+        """Pencereyi baştan indirir (with window.lock altında çağrılmalı)"""
+        data = self.fetch(puuid, 0, end_index, queue)
+        if not data:
+            return False
+
+        window.entries = list(data.get("History", []))
+        window.total = data.get("Total", len(window.entries))
+        window.refreshed_at = time.monotonic()
+        return True
+
+    def _refresh_head(self, window: _Window, puuid: str, queue: str):
+        """
+        Sadece en yeni maçları ister ve pencerenin başına ekler (with window.lock altında çağrılmalı)
+        Eski baş yeni cevapta yoksa (arada HEAD_REFRESH_SIZE'dan fazla maç oynanmış) pencere baştan indirilir.
+        """
+        data = self.fetch(puuid, 0, HEAD_REFRESH_SIZE, queue)
+        if not data:
+            return
+
+        head = data.get("History", [])
+        if not window.entries:
+            window.entries = list(head)
+        else:
+            head_ids = [entry.get("MatchID") for entry in head]
+            old_head = window.entries[0].get("MatchID")
+            if old_head not in head_ids:
+                self.counters['refetches'] += 1
+                self._refetch(window, puuid, max(len(window.entries), HEAD_REFRESH_SIZE), queue)
+                return
+            window.entries = (head[:head_ids.index(old_head)] + window.entries)[:MAX_ENTRIES]
+
+        window.total = data.get("Total", window.total)
+        window.refreshed_at = time.monotonic()
+        self.counters['head_refreshes'] += 1
+
+    def _extend(self, window: _Window, puuid: str, end_index: int, queue: str):
+        """Pencerenin sonuna end_index'e kadar olan maçları ekler (with window.lock altında çağrılmalı)"""
+        data = self.fetch(puuid, len(window.entries), end_index, queue)
+        if not data:
+            return
+
+        known_ids = {entry.get("MatchID") for entry in window.entries}
+        window.entries.extend(entry for entry in data.get("History", []) if entry.get("MatchID") not in known_ids)
+        window.total = data.get("Total", window.total)
+        self.counters['extensions'] += 1
+
+    def stats(self) -> Dict:
+        """
+        Pencere sayısı ve sayaçlar
+        Returns:
+            dict: {windows, hits, initial, head_refreshes, extensions, refetches}
+        """
+        with self._lock:
+            return {'windows': len(self._windows), **self.counters}
+
+    def clear(self):
+        """Tüm pencereleri siler"""
+        with self._lock:
+            self._windows.clear()
@@ -0,0 +1,62 @@
+"""
+HTTP Session
+Keep-alive bağlantı havuzlu requests session'ları
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict
+from config.settings import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """timeout verilmeyen isteklere varsayılan timeout ekleyen adapter"""
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT, verify: bool = True, **kwargs):
+        self.timeout = timeout
+        self.verify = verify
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        # session.verify=False, REQUESTS_CA_BUNDLE ortam değişkeni varken ezilir
+        if not self.verify:
+            kwargs["verify"] = False
+        return super().send(request, **kwargs)
+
+
+def create_session(
+    headers: Optional[Dict[str, str]] = None,
+    verify: bool = True,
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    timeout: float = HTTP_TIMEOUT
+) -> requests.Session:
+    """
+    Bağlantıları yeniden kullanan (TCP + TLS handshake'i bir kez yapılan) session oluşturur
+    Tracker döngüsü ve Flask thread'i aynı session'ı paylaşabilir (urllib3 havuzu thread-safe)
+    Args:
+        headers: Her isteğe eklenecek header'lar
+        verify: SSL sertifika doğrulaması
+        pool_connections: Havuzda tutulacak host sayısı
+        pool_maxsize: Host başına açık tutulacak bağlantı sayısı
+        timeout: Varsayılan timeout (saniye)
+    Returns:
+        requests.Session: Havuzlu session
+    """
+    session = requests.Session()
+    session.verify = verify
+    session.headers.update({"Accept-Encoding": "gzip, deflate"})
+    if headers:
+        session.headers.update(headers)
+
+    adapter = TimeoutHTTPAdapter(
+        timeout=timeout,
+        verify=verify,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
@@ -0,0 +1,136 @@
+"""
+Rate Limiter
+Host bazlı (glz, pd, shared) token bucket'lar, 429 sonrası adaptif hız
+"""
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# acquire() iptal kontrolü verildiğinde beklemenin en uzun parçası (saniye)
+CANCEL_CHECK_INTERVAL = 0.25
+
+
+class TokenBucket:
+    """Thread-safe token bucket (sabit sleep'ler yerine ortak istek bütçesi)"""
+
+    def __init__(self, rate: float, capacity: float, min_rate: Optional[float] = None, name: str = ""):
+        """
+        Args:
+            rate: Saniyede eklenen token (istek/saniye), aynı zamanda üst sınır
+            capacity: Biriktirilebilecek maksimum token (anlık patlama)
+            min_rate: 429 sonrası düşülebilecek en düşük hız
+            name: Log için bucket adı
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 8
+        self.capacity = capacity
+        self.name = name
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """Geçen süreye göre token ekler (lock altında çağrılmalı)"""
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, cancelled: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Bir token alınana kadar bekler (Retry-After süresi dolmadan token verilmez)
+        Args:
+            cancelled: Bekleme sırasında kontrol edilir, True dönerse token alınmadan vazgeçilir
+        Returns:
+            bool: Token alındıysa True, iptal edildiyse False (token diğer isteklere kalır)
+        """
+        while True:
+            if cancelled and cancelled():
+                return False
+
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return True
+                    wait = (1 - self._tokens) / self.rate
+
+            # İptal kontrolü varsa uzun beklemeler parçalanır
+            time.sleep(min(wait, CANCEL_CHECK_INTERVAL) if cancelled else wait)
+
+    def on_success(self):
+        """Başarılı istek: hızı yavaşça üst sınıra geri yükselt (additive increase)"""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def on_rate_limited(self, retry_after: float):
+        """
+        429 alındı: Retry-After süresince bekle ve hızı yarıya indir (multiplicative decrease)
+        Args:
+            retry_after: Beklenecek süre (saniye)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0
+            self._updated = now + retry_after
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """
+    Retry-After header'ını saniyeye çevirir (saniye veya HTTP tarihi olabilir)
+    Args:
+        value: Header değeri
+        default: Header yoksa/okunamazsa kullanılacak süre
+    Returns:
+        float: Beklenecek süre (saniye)
+    """
+    if not value:
+        return default
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """Riot host grupları (glz, pd, shared) için ayrı token bucket'lar"""
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]]):
+        """
+        Args:
+            limits: {host_grubu: (istek/saniye, patlama kapasitesi)}
+        """
+        self.buckets = {
+            name: TokenBucket(rate, capacity, name=name)
+            for name, (rate, capacity) in limits.items()
+        }
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """
+        URL'nin host'una göre bucket seçer
+        Args:
+            url: İstek URL'si
+        Returns:
+            TokenBucket: glz-*, pd.*, shared.* veya default bucket
+        """
+        host = urlparse(url).hostname or ""
+        group = host.split(".")[0].split("-")[0]
+        return self.buckets.get(group, self.buckets["default"])
@@ -0,0 +1,96 @@
+"""
+Snapshot Slot
+Tracker ile web sunucusu arasında aynı process içinde paylaşılan, versiyonlu oyun verisi
+Tracker her güncellemede yeni (değiştirilemez) bir snapshot koyar; web sunucusu aynı nesneyi kopyalamadan okur.
+JSON'a çevirip loopback HTTP isteği atmaya gerek kalmaz; /api/game/update sadece process dışı kaynaklar içindir.
+"""
+import time
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
+
+# Web'e gösterilen oyun bilgisi (players salt okunur oyuncu sözlüklerinin tuple'ı, ham match_details taşınmaz)
+GameSnapshot = namedtuple("GameSnapshot", ["match_id", "stage", "players"])
+
+
+def make_game_snapshot(game_info: Optional[Dict]) -> Optional[GameSnapshot]:
+    """
+    get_full_game_info_async sonucundan değiştirilemez snapshot oluşturur
+    Args:
+        game_info: Oyun bilgisi (veya None)
+    Returns:
+        GameSnapshot: match_id, stage, players veya None
+    """
+    if not game_info:
+        return None
+
+    return GameSnapshot(
+        match_id=game_info.get("match_id"),
+        stage=game_info.get("stage", "complete"),
+        players=tuple(MappingProxyType(dict(player)) for player in game_info.get("players", []))
+    )
+
+
+class SnapshotSlot:
+    """Tek değer tutan, değiştikçe versiyonu artan ve bekleyenleri uyandıran slot"""
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        # Versiyon zamandan başlar: sunucu yeniden başlasa da istemcinin eski versiyonu yenisiyle çakışmaz
+        self._version = int(time.time() * 1000)
+        self._value = None
+        self._closed = False
+
+    def publish(self, value: Any, force: bool = False) -> bool:
+        """
+        Yeni değeri koyar (değer yayınlandıktan sonra değiştirilmemeli)
+        Args:
+            value: Yeni değer
+            force: Değer aynı olsa da versiyonu artır (değerden türetilen veri değiştiyse)
+        Returns:
+            bool: Versiyon arttıysa True (değer öncekiyle aynıysa False)
+        """
+        with self._changed:
+            if not force and value == self._value:
+                return False
+            self._value = value
+            self._version += 1
+            self._changed.notify_all()
+            return True
+
+    def get(self) -> Tuple[int, Any]:
+        """
+        Returns:
+            tuple: (versiyon, değer)
+        """
+        with self._changed:
+            return self._version, self._value
+
+    def wait(self, version: int, timeout: float) -> Tuple[int, Any]:
+        """
+        Versiyon verilenden farklı olana kadar (en fazla timeout kadar) bekler
+        Args:
+            version: Okuyucunun elindeki versiyon
+            timeout: Maksimum bekleme süresi (saniye)
+        Returns:
+            tuple: (versiyon, değer) - süre dolduysa veya slot kapatıldıysa versiyon aynı kalır
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != version or self._closed, timeout)
+            return self._version, self._value
+
+    def close(self):
+        """Bekleyenleri uyandırır; sonraki wait() çağrıları beklemeden döner (kapanışta stream'ler biter)"""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """close() çağrıldı mı"""
+        return self._closed
+
+
+# Tracker'ın yazdığı, web sunucusunun okuduğu oyun snapshot'ı
+game_snapshot = SnapshotSlot()
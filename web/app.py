@@ -2,15 +2,26 @@
 X-Tracker Web API Servisi
 Oyun bilgilerini ve oyuncu Vandal skinlerini web sitesinde gösterir
 """
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request
 from flask_cors import CORS
 import os
 import sys
+import gzip
+import json
+import time
+import select
+import socket
+import threading
+from collections import namedtuple
 
 # Parent dizini path'e ekle
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.valorant_api import ValorantAPIService
+from config.settings import (
+    SSE_HEARTBEAT_INTERVAL, SSE_RETRY_MS, SSE_MAX_STREAMS, SSE_DISCONNECT_CHECK_INTERVAL, WEB_GZIP_MIN_SIZE
+)
+from utils.snapshot import GameSnapshot, game_snapshot, make_game_snapshot
 
 app = Flask(__name__, template_folder='templates', static_folder='static')
 CORS(app)
@@ -20,10 +31,18 @@ valorant_api = ValorantAPIService()
 
 # Cache için global değişkenler
 _vandal_skins_cache = None
-_current_game_data = None
 _riot_api_instance = None
 _player_stats_service = None
 
+# /api/game cevabı snapshot versiyonu başına bir kez JSON'a (ve gerekirse gzip'e) çevrilir
+# body: JSON byte'ları, gzipped: sıkıştırılmış hali (küçük cevaplarda None)
+EncodedPayload = namedtuple("EncodedPayload", ["version", "body", "gzipped"])
+_game_payload = EncodedPayload(None, b"", None)
+_game_payload_lock = threading.Lock()
+
+# Her açık SSE stream'i bir sunucu thread'ini tutar; sınır dolunca yeni stream'ler 503 alır
+_stream_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
 
 def get_vandal_skins_with_icons():
     """Vandal skinlerini displayIcon ile birlikte cache'le"""
@@ -35,14 +54,102 @@ def get_vandal_skins_with_icons():
 
 
 def set_game_data(game_info: dict):
-    """Oyun verisini web için kaydet"""
-    global _current_game_data
-    _current_game_data = game_info
+    """Oyun verisini web için kaydet (değiştiyse bağlı dashboard'lara gönderilir)"""
+    game_snapshot.publish(make_game_snapshot(game_info))
 
 
 def get_game_data():
-    """Mevcut oyun verisini döndür"""
-    return _current_game_data
+    """Mevcut oyun snapshot'ını döndür"""
+    return game_snapshot.get()[1]
+
+
+def _build_game_payload(snapshot: GameSnapshot) -> dict:
+    """
+    Oyun snapshot'ından /api/game cevabını oluşturur (oyunculara Vandal skin ikonu eklenir)
+    Args:
+        snapshot: Tracker'ın yayınladığı snapshot veya None
+    Returns:
+        dict: /api/game cevabı
+    """
+    if not snapshot:
+        return {
+            "status": "no_game",
+            "message": "Aktif oyun yok"
+        }
+
+    # Vandal skin ikonlarını al
+    vandal_skins = get_vandal_skins_with_icons()
+
+    # Oyuncu verilerine skin icon ekle
+    players_with_icons = []
+    for player in snapshot.players:
+        skin_uuid = player.get("skin_uuid", "").lower()
+        skin_data = vandal_skins.get(skin_uuid, {})
+
+        players_with_icons.append({
+            **player,
+            "skin_icon": skin_data.get("displayIcon", "")
+        })
+
+    return {
+        "status": "success",
+        "match_id": snapshot.match_id,
+        "stage": snapshot.stage,
+        "players": players_with_icons
+    }
+
+
+def get_game_payload(version: int, snapshot: GameSnapshot) -> EncodedPayload:
+    """
+    Snapshot versiyonunun kodlanmış /api/game cevabı (son versiyonunki saklanır, sonraki istekler yeniden kodlamaz)
+    Args:
+        version: Snapshot versiyonu
+        snapshot: O versiyonun snapshot'ı
+    Returns:
+        EncodedPayload: version, body (JSON byte'ları), gzipped (veya None)
+    """
+    global _game_payload
+    payload = _game_payload
+    if payload.version == version:
+        return payload
+
+    # Skin listesi (soğuk cache'de valorant-api.com isteği) ve kodlama kilit dışında yapılır;
+    # kilit sadece saklanan cevabı değiştirirken tutulur, eski versiyon yenisinin üzerine yazılmaz
+    body = json.dumps(_build_game_payload(snapshot), separators=(",", ":")).encode()
+    gzipped = gzip.compress(body, mtime=0) if len(body) >= WEB_GZIP_MIN_SIZE else None
+    payload = EncodedPayload(version, body, gzipped)
+    with _game_payload_lock:
+        if _game_payload.version is None or _game_payload.version < version:
+            _game_payload = payload
+    return payload
+
+
+def _client_disconnected(client: socket.socket) -> bool:
+    """
+    SSE istemcisi bağlantıyı kapattı mı (istemci stream'e veri göndermez; okunabilir soket kapanış demektir)
+    Args:
+        client: İsteğin soketi (sunucu vermiyorsa None)
+    Returns:
+        bool: Bağlantı kapandıysa True
+    """
+    if client is None:
+        return False
+    try:
+        readable, _, _ = select.select([client], [], [], 0)
+        return bool(readable) and not client.recv(1, socket.MSG_PEEK)
+    except OSError:
+        return True
+
+
+def close_streams():
+    """Açık SSE stream'lerini bitirir (sunucu kapanırken thread'ler serbest kalır)"""
+    game_snapshot.close()
+
+
+def set_valorant_api(service: ValorantAPIService):
+    """Tracker'ın ValorantAPIService instance'ını (ve bağlantı havuzunu) paylaş"""
+    global valorant_api
+    valorant_api = service
 
 
 def set_riot_api(riot_api):
@@ -64,11 +171,14 @@ def index():
 def get_current_game():
     """
     Mevcut oyun bilgilerini döndürür (oyuncular ve Vandal skinleri dahil)
-    
+    Cevap snapshot versiyonu başına bir kez kodlanır ve ETag ile gönderilir; If-None-Match
+    güncel versiyonla eşleşirse gövdesiz 304 döner. İstemci kabul ediyorsa gzip'li hali gönderilir.
+
     Returns:
         JSON: {
             "status": "success" | "no_game",
             "match_id": str,
+            "stage": "basic" | "ranks" | "stats" | "complete" (rank/KD/HS henüz gelmediyse "..."),
             "players": [
                 {
                     "game_name": str,
@@ -84,39 +194,84 @@ def get_current_game():
             ]
         }
     """
-    game_data = get_game_data()
-    
-    if not game_data:
-        return jsonify({
-            "status": "no_game",
-            "message": "Aktif oyun yok"
-        })
-    
-    # Vandal skin ikonlarını al
-    vandal_skins = get_vandal_skins_with_icons()
-    
-    # Oyuncu verilerine skin icon ekle
-    players_with_icons = []
-    for player in game_data.get("players", []):
-        skin_uuid = player.get("skin_uuid", "").lower()
-        skin_data = vandal_skins.get(skin_uuid, {})
-        
-        players_with_icons.append({
-            **player,
-            "skin_icon": skin_data.get("displayIcon", "")
-        })
-    
-    return jsonify({
-        "status": "success",
-        "match_id": game_data.get("match_id"),
-        "players": players_with_icons
+    payload = get_game_payload(*game_snapshot.get())
+    use_gzip = payload.gzipped is not None and request.accept_encodings['gzip']
+    # İki gösterim aynı veriyi taşır; istemcide hangisi varsa 304 yeterlidir
+    etags = (str(payload.version), f"{payload.version}-gzip")
+    etag = etags[1] if use_gzip else etags[0]
+
+    if any(request.if_none_match.contains_weak(tag) for tag in etags):
+        response = Response(status=304)
+    else:
+        response = Response(payload.gzipped if use_gzip else payload.body, mimetype='application/json')
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+
+    response.set_etag(etag)
+    # Tarayıcı her seferinde ETag ile sorar (değişiklik yoksa 304)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+@app.route('/api/game/stream')
+def stream_game():
+    """
+    Oyun bilgilerini Server-Sent Events ile gönderir (/api/game ile aynı veri)
+    Bağlanınca güncel veri, sonra sadece veri değiştiğinde yenisi gönderilir; değişiklik yokken
+    SSE_HEARTBEAT_INTERVAL'da bir yorum satırı (heartbeat) yazılır. Kopan istemci SSE_DISCONNECT_CHECK_INTERVAL
+    içinde fark edilir ve stream biter.
+    Yeniden bağlanan tarayıcı Last-Event-ID ile son aldığı versiyonu bildirir; versiyon aynıysa tekrar gönderilmez.
+    Aynı anda en fazla SSE_MAX_STREAMS stream açılır; fazlası 503 alır (dashboard polling'e geçer).
+
+    Returns:
+        text/event-stream: id: <versiyon>, data: <JSON>
+    """
+    if not _stream_slots.acquire(blocking=False):
+        response = jsonify({"status": "error", "message": "Çok fazla açık stream"})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(SSE_RETRY_MS // 1000)
+        return response
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    client = request.environ.get('werkzeug.socket')
+
+    def events():
+        sent_version = last_event_id
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+
+        heartbeat_at = time.monotonic() + SSE_HEARTBEAT_INTERVAL
+        version, snapshot = game_snapshot.get()
+        while not game_snapshot.closed:
+            if str(version) == sent_version:
+                # Kısa aralıklarla beklenir: kopan istemcinin thread'i heartbeat yazılmasını beklemeden serbest kalır
+                version, snapshot = game_snapshot.wait(version, SSE_DISCONNECT_CHECK_INTERVAL)
+                if game_snapshot.closed or _client_disconnected(client):
+                    break
+
+                if str(version) == sent_version:
+                    if time.monotonic() >= heartbeat_at:
+                        heartbeat_at = time.monotonic() + SSE_HEARTBEAT_INTERVAL
+                        yield ": heartbeat\n\n"
+                    continue
+
+            sent_version = str(version)
+            heartbeat_at = time.monotonic() + SSE_HEARTBEAT_INTERVAL
+            yield f"id: {sent_version}\ndata: {get_game_payload(version, snapshot).body.decode()}\n\n"
+
+    response = Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
     })
+    # Stream bitince (istemci koptu veya sunucu kapanıyor) yer boşalır
+    response.call_on_close(_stream_slots.release)
+    return response
 
 
 @app.route('/api/game/update', methods=['POST'])
 def update_game_data():
     """
-    Oyun verisini güncelle (tracker'dan çağrılır)
+    Oyun verisini güncelle (process dışındaki kaynaklar için; tracker snapshot'ı doğrudan paylaşımlı slot'a koyar)
     """
     data = request.get_json()
     if data:
@@ -175,6 +330,8 @@ def refresh_cache():
     global _vandal_skins_cache
     _vandal_skins_cache = None
     get_vandal_skins_with_icons()
+    # Skin ikonları değişmiş olabilir: aynı snapshot yeni versiyonla yayınlanır, cevap yeniden oluşturulur
+    game_snapshot.publish(game_snapshot.get()[1], force=True)
 
     return jsonify({
         "status": "success",
@@ -182,6 +339,66 @@ def refresh_cache():
     })
 
 
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    """
+    Cache tiplerinin kayıt/byte sayılarını ve hit/miss/eviction sayaçlarını döndürür
+    """
+    from utils.cache import cache
+    from utils.disk_cache import disk_cache
+
+    return jsonify({
+        "status": "success",
+        "data": cache.stats(),
+        "disk": disk_cache.stats(),
+        "history": _riot_api_instance.history_store.stats() if _riot_api_instance else None
+    })
+
+
+@app.route('/api/player-stats', methods=['POST'])
+def get_lobby_player_stats():
+    """
+    Birden fazla oyuncunun son 5 maçtan KD ve HS% istatistiklerini tek istekte döndürür
+    Sonuçlar NDJSON olarak, her oyuncu hesaplandığı anda bir satır halinde gönderilir (istek sırasıyla değil).
+
+    Body:
+        JSON: {"puuids": [str, ...]}
+
+    Returns:
+        application/x-ndjson: her satır {
+            "puuid": str,
+            "status": "success" | "error",
+            "data": {...} (/api/player-stats/<puuid> ile aynı) | "message": str
+        }
+    """
+    if not _player_stats_service:
+        return jsonify({
+            "status": "error",
+            "message": "Stats servisi hazır değil"
+        }), 503
+
+    data = request.get_json(silent=True) or {}
+    puuids = data.get("puuids")
+    if not isinstance(puuids, list) or not all(isinstance(puuid, str) for puuid in puuids) or not puuids:
+        return jsonify({
+            "status": "error",
+            "message": "puuids listesi gerekli"
+        }), 400
+
+    def lines():
+        for puuid, stats in _player_stats_service.iter_kd_hs_stats(list(dict.fromkeys(puuids)), match_count=5):
+            if stats:
+                line = {"puuid": puuid, "status": "success", "data": stats}
+            else:
+                line = {"puuid": puuid, "status": "error", "message": "İstatistikler alınamadı"}
+            yield json.dumps(line) + "\n"
+
+    return Response(lines(), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
 @app.route('/api/player-stats/<puuid>')
 def get_player_kd_hs(puuid):
     """
@@ -236,9 +453,12 @@ if __name__ == '__main__':
     print("")
     print("📍 API Endpoints:")
     print("   GET  /api/game         - Mevcut oyun bilgileri")
+    print("   GET  /api/game/stream  - Oyun bilgileri (Server-Sent Events)")
     print("   POST /api/game/update  - Oyun verisini güncelle")
     print("   GET  /api/skin/<uuid>  - Skin bilgisi")
     print("   GET  /api/vandal-skins - Tüm Vandal skinleri")
     print("   GET  /api/refresh      - Cache yenile")
+    print("   GET  /api/cache/stats  - Cache istatistikleri")
+    print("   POST /api/player-stats - Lobi KD/HS istatistikleri (NDJSON)")
     print("")
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,106 @@
+"""
+X-Tracker Web Sunucusu
+Dashboard'u Werkzeug'un thread'li sunucusuyla (bağlantı başına bir thread) sunar
+Aynı anda çalışan thread sayısı WEB_SERVER_THREADS ile sınırlıdır; dolunca yeni bağlantılar bir thread
+boşalana kadar kabul kuyruğunda bekler. Süresi belirsiz SSE stream'leri web/app.py'de SSE_MAX_STREAMS ile
+ayrıca sınırlanır (WEB_SERVER_THREADS'ten küçük), böylece açık dashboard'lar kısa isteklerin thread'ini tüketmez.
+Werkzeug her cevaptan sonra bağlantıyı kapatır (keep-alive yok); istemcide açık kalan tek bağlantı SSE'dir.
+stop() yeni bağlantı kabulünü durdurur ve süren istekleri WEB_SHUTDOWN_TIMEOUT kadar bekler.
+"""
+import threading
+from typing import Optional
+
+from werkzeug.serving import ThreadedWSGIServer, WSGIRequestHandler
+
+from config.settings import WEB_SERVER_THREADS, WEB_REQUEST_TIMEOUT, WEB_SHUTDOWN_TIMEOUT
+
+
+class RequestHandler(WSGIRequestHandler):
+    """HTTP/1.1 istemcilerine uzunluğu bilinmeyen cevapları chunked, HTTP/1.0 istemcilerine düz gönderen handler"""
+
+    protocol_version = "HTTP/1.1"
+    # İsteği yarım bırakan istemci thread'i süresiz tutmaz
+    timeout = WEB_REQUEST_TIMEOUT
+
+    def run_wsgi(self):
+        # Werkzeug chunked kararını handler'ın protokolüne göre verir; HTTP/1.0 chunked bilmez,
+        # o istemcilere HTTP/1.0 ile cevap verilir (gövde bağlantı kapanınca biter)
+        if self.request_version != "HTTP/1.1":
+            self.protocol_version = "HTTP/1.0"
+        return super().run_wsgi()
+
+    def log_error(self, format: str, *args):
+        # Yarım kalan isteğin süresinin dolması hata değildir
+        if format.startswith("Request timed out"):
+            return
+        super().log_error(format, *args)
+
+
+class WebServer(ThreadedWSGIServer):
+    """Thread sayısı sınırlı, düzgün kapanan thread'li WSGI sunucusu"""
+
+    def __init__(self, host: str, port: int, app, threads: int = WEB_SERVER_THREADS):
+        """
+        Args:
+            host: Dinlenecek adres
+            port: Dinlenecek port
+            app: WSGI uygulaması (Flask app)
+            threads: Aynı anda işlenen maksimum bağlantı (açık her SSE stream'i de bir thread kullanır)
+        """
+        super().__init__(host, port, app, handler=RequestHandler)
+        self._slots = threading.BoundedSemaphore(threads)
+        self._active = 0
+        self._idle = threading.Condition()
+        self._stopping = threading.Event()
+        self._serve_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Bağlantı kabul döngüsünü arka planda başlatır"""
+        self._serve_thread = threading.Thread(target=self.serve_forever, name="web-accept", daemon=True)
+        self._serve_thread.start()
+
+    def process_request(self, request, client_address):
+        """Bağlantı için thread açar (sınır doluysa bir thread boşalana kadar bekler, kapanışta vazgeçer)"""
+        while not self._slots.acquire(timeout=0.5):
+            if self._stopping.is_set():
+                self.shutdown_request(request)
+                return
+
+        with self._idle:
+            self._active += 1
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._finished()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        """Bağlantıyı işler, bitince thread'in yerini boşaltır"""
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._finished()
+
+    def _finished(self):
+        """Bağlantı thread'i bitti: sayacı düşürür, yeri boşaltır"""
+        with self._idle:
+            self._active -= 1
+            self._idle.notify_all()
+        self._slots.release()
+
+    def stop(self, timeout: float = WEB_SHUTDOWN_TIMEOUT):
+        """
+        Sunucuyu düzgünce kapatır
+        Yeni bağlantı kabul edilmez, süren istekler en fazla timeout kadar beklenir (thread'ler daemon'dır,
+        süre dolarsa process'in çıkmasını engellemez). Açık SSE stream'leri bu çağrıdan önce bitirilmelidir.
+        Args:
+            timeout: Süren istekler için maksimum bekleme (saniye)
+        """
+        self._stopping.set()
+        if self._serve_thread:
+            self.shutdown()
+            self._serve_thread.join()
+
+        with self._idle:
+            self._idle.wait_for(lambda: self._active == 0, timeout)
+        self.server_close()